@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark link metadata extraction: the single-pass MetaTagParser used by
+update_links.py against the BeautifulSoup DOM approach it replaced.
+"""
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from update_links import extract_html_metadata, slugify, sniff_charset
+
+SAVED_FROM_PREFIX = "<!-- saved from url="
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark link metadata extraction",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Save some pages to the corpus
+  python scripts/benchmark_metadata.py --save https://www.washingtonpost.com/ https://github.com/
+
+  # Benchmark every page in the corpus
+  python scripts/benchmark_metadata.py
+
+  # More repetitions per page for steadier timings
+  python scripts/benchmark_metadata.py --repeat 50
+        """,
+    )
+
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default="./cache/html_corpus",
+        help="Directory of saved .html pages (default: ./cache/html_corpus)",
+    )
+
+    parser.add_argument(
+        "--save",
+        nargs="+",
+        metavar="URL",
+        help="Download these pages into the corpus before benchmarking",
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Timed runs per page and extractor (default: 20)",
+    )
+
+    return parser.parse_args()
+
+
+def extract_metadata_with_soup(html: str, url: str) -> Dict[str, Optional[str]]:
+    """The previous get_url_metadata extraction: a full BeautifulSoup DOM"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def find_meta(property=None, name=None):
+        tag = (
+            soup.find("meta", property=property)
+            if property
+            else soup.find("meta", attrs={"name": name})
+        )
+        return tag.get("content") if tag else None
+
+    title = (
+        find_meta(property="og:title")
+        or find_meta(name="twitter:title")
+        or (soup.find("title").text.strip() if soup.find("title") else None)
+    )
+    description = (
+        find_meta(property="og:description")
+        or find_meta(name="twitter:description")
+        or find_meta(name="description")
+    )
+    image = find_meta(property="og:image") or find_meta(name="twitter:image")
+    if image:
+        image = urljoin(url, image)
+
+    return {"title": title, "description": description, "image": image}
+
+
+def save_pages(urls: List[str], corpus: str) -> None:
+    """Download full pages into the corpus, recording where each came from"""
+    os.makedirs(corpus, exist_ok=True)
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    }
+    for url in urls:
+        try:
+            response = requests.get(url, headers=headers, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error saving {url}: {e}")
+            continue
+
+        path = os.path.join(corpus, f"{slugify(url)[:100]}.html")
+        with open(path, "wb") as f:
+            f.write(f"{SAVED_FROM_PREFIX}{url} -->\n".encode("utf-8"))
+            f.write(response.content)
+        print(f"Saved {url} ({len(response.content) / 1024:.0f} KB) to {path}")
+
+
+def load_page(path: str) -> Tuple[str, str]:
+    """Read a saved page, returning (url, html)"""
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    url = "https://example.com/"
+    first_line, _, rest = raw.partition(b"\n")
+    if first_line.startswith(SAVED_FROM_PREFIX.encode("utf-8")):
+        url = first_line.decode("utf-8")[len(SAVED_FROM_PREFIX) :].rstrip(" ->")
+        raw = rest
+
+    return url, raw.decode(sniff_charset(None, raw[:4096]), errors="replace")
+
+
+def measure(
+    extract: Callable[[str, str], Dict], html: str, url: str, repeat: int
+) -> Tuple[float, int, Dict]:
+    """Return (median seconds, peak traced bytes, result) for one extractor"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract(html, url)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    extract(html, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak, result
+
+
+def main():
+    args = parse_args()
+
+    if args.save:
+        save_pages(args.save, args.corpus)
+
+    paths = (
+        sorted(
+            os.path.join(args.corpus, name)
+            for name in os.listdir(args.corpus)
+            if name.endswith(".html")
+        )
+        if os.path.isdir(args.corpus)
+        else []
+    )
+    if not paths:
+        print(f"No pages in {args.corpus}. Add some with --save URL ...")
+        return
+
+    print(
+        f"{'page':<40} {'KB':>6} {'soup ms':>8} {'parser ms':>9} {'speedup':>7}"
+        f" {'soup peak KB':>12} {'parser peak KB':>14}  same"
+    )
+    totals = [0.0, 0.0]
+    for path in paths:
+        url, html = load_page(path)
+        soup_time, soup_peak, soup_result = measure(
+            extract_metadata_with_soup, html, url, args.repeat
+        )
+        parser_time, parser_peak, parser_result = measure(
+            extract_html_metadata, html, url, args.repeat
+        )
+        totals[0] += soup_time
+        totals[1] += parser_time
+
+        print(
+            f"{os.path.basename(path)[:40]:<40} {len(html) / 1024:>6.0f}"
+            f" {soup_time * 1000:>8.2f} {parser_time * 1000:>9.2f}"
+            f" {soup_time / parser_time:>6.1f}x"
+            f" {soup_peak / 1024:>12.0f} {parser_peak / 1024:>14.0f}"
+            f"  {'yes' if soup_result == parser_result else 'NO'}"
+        )
+        if soup_result != parser_result:
+            print(f"  soup:   {soup_result}")
+            print(f"  parser: {parser_result}")
+
+    print(
+        f"\nTotal: soup {totals[0] * 1000:.1f} ms, parser {totals[1] * 1000:.1f} ms"
+        f" ({totals[0] / totals[1]:.1f}x) across {len(paths)} page(s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,10 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List
 
-from atproto import Client
 from dotenv import load_dotenv
 
+from update_links import get_bluesky_client
+
 load_dotenv()
 
 # Constants
@@ -68,8 +69,8 @@ def fetch_bluesky_analytics(days: int = 30) -> List[Dict]:
         List of dicts with keys: date, platform, post_text, post_link,
         likes, reposts, replies, quotes, has_media, is_reply
     """
-    client = Client()
-    client.login(BLUESKY_HANDLE, os.environ["BLUESKY_APP_PASSWORD"])
+    # Resumes update_links.py's saved session rather than logging in again
+    client = get_bluesky_client()
 
     # Calculate date threshold
     cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
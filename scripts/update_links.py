@@ -1,15 +1,41 @@
 #!/usr/bin/env python3
 
+import asyncio
+import base64
+import codecs
 import hashlib
+import importlib.util
+import json
+import multiprocessing
 import re
 import os
 import requests
+import shutil
+import tempfile
+import threading
 import time
-from typing import Dict, List, Optional, TypedDict
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from html import unescape as html_unescape
+from html.parser import HTMLParser
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+)
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from github import Github
-from atproto import Client, client_utils
+from atproto import Client, Request, client_utils, models
+from atproto.exceptions import RateLimitExceededError
 from dotenv import load_dotenv
 from PIL import Image
 import io
@@ -19,13 +45,19 @@ import argparse
 load_dotenv()
 
 
-class ImageInfo(TypedDict):
-    """Represents an image with metadata"""
-
+class ImageSource(TypedDict):
     src: str
     alt: Optional[str]
 
 
+class ImageInfo(ImageSource, total=False):
+    """Represents an image with metadata. Width and height are only set when
+    the issue's <img> tag gave them."""
+
+    width: int
+    height: int
+
+
 class Post(TypedDict):
     """Represents a post with metadata"""
 
@@ -34,68 +66,1376 @@ class Post(TypedDict):
     images: Optional[List[ImageInfo]]
 
 
+class ImageIndexEntry(TypedDict):
+    """A downloaded image: its content hash and where copies of it live"""
+
+    sha256: str
+    ext: str
+    size: int
+    paths: List[str]
+
+
+class ImageVariantEntry(ImageIndexEntry):
+    """An optimized copy of an image, at its pixel dimensions"""
+
+    width: int
+    height: int
+
+
+class ImageManifestEntry(TypedDict):
+    """What we know about an image, so it's never decoded just for its size"""
+
+    sha256: str
+    width: int
+    height: int
+    bytes: int
+    mime: str
+
+
+class LinkThumbnailEntry(ImageIndexEntry):
+    """A link card thumbnail, and the og:image it was made from"""
+
+    image: str
+
+
+class UploadEntry(TypedDict):
+    """A platform's media ID (or blob reference) for an uploaded image"""
+
+    result: object
+    uploaded_at: float
+    expires_at: Optional[float]
+
+
+class PublishOutcome(TypedDict):
+    """How posting a thread to one platform went. Status is "posted",
+    "skipped", "deferred" (see RateLimitDeferred) or "failed"; posts counts
+    what made it up either way."""
+
+    platform: str
+    status: str
+    posts: int
+    detail: Optional[str]
+    seconds: float
+
+
+class PublishJournalEntry(TypedDict):
+    """One published part of an issue's thread. thread_index is the post's
+    place in the thread and split_index the part it was split into to fit
+    the platform; X's trailing link replies come after the last post."""
+
+    issue: str
+    platform: str
+    thread_index: int
+    split_index: int
+    post_id: str
+    cid: Optional[str]
+    published_at: float
+
+
+class FingerprintEntry(TypedDict):
+    """A post we've published, for spotting it again (see text_fingerprint)"""
+
+    platform: str
+    post_id: str
+    simhash: Optional[int]
+    urls: List[str]
+    posted_at: float
+
+
+class FingerprintRefresh(TypedDict):
+    """When a platform's timeline was last read into the fingerprint index"""
+
+    refreshed_at: float
+    since_id: Optional[str]
+
+
+class RedirectEntry(TypedDict):
+    """Where a short link ended up, and the hops it took to get there"""
+
+    canonical: str
+    chain: List[str]
+    resolved_at: float
+
+
+class UrlFailureEntry(TypedDict):
+    """A remembered metadata fetch failure"""
+
+    failures: int
+    error: str
+    failed_at: float
+    retry_at: float
+
+
+class UrlMetadataEntry(TypedDict, total=False):
+    """A cached get_url_metadata result plus what's needed to revalidate it"""
+
+    title: Optional[str]
+    description: Optional[str]
+    image: Optional[str]
+    fetched_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
 # https://mastodon.social/api/v1/accounts/lookup?acct=kevinschaul
 MASTODON_USER_ID = "112973733509746771"
 BLUESKY_HANDLE = "kevinschaul.bsky.social"
 
+SITE_HOSTS = ("kschaul.com", "www.kschaul.com")
+SITE_IMAGE = "https://kschaul.com/social.jpg"
+CONTENT_DIR = "./content"
+
+# Structured metadata sources used by the resolvers in METADATA_RESOLVERS
+# instead of scraping HTML
+YOUTUBE_OEMBED_ENDPOINT = "https://www.youtube.com/oembed"
+BLUESKY_OEMBED_ENDPOINT = "https://embed.bsky.app/oembed"
+GITHUB_API_ENDPOINT = "https://api.github.com"
+
 MASTODON_CHAR_LIMIT = 500
 BLUESKY_CHAR_LIMIT = 300
 X_CHAR_LIMIT = 280
 
+# Every outbound HTTP request goes through one pooled session (see
+# get_http_session). Idempotent requests are retried with exponential
+# backoff on connection errors and these statuses; POSTs never are, so a
+# retry can't double-post. A server's Retry-After is honored only up to
+# HTTP_BACKOFF_MAX seconds, so one slow host can't stall the whole run.
+HTTP_TIMEOUT = 10
+HTTP_UPLOAD_TIMEOUT = 60
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_BACKOFF_MAX = 10
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_POOL_HOSTS = 20
+HTTP_POOL_SIZE_PER_HOST = 10
+
+# Caches live in the repo so they survive the ephemeral CI runners: the
+# workflow commits everything it changes, including this directory.
+CACHE_DIR = "./cache"
+METADATA_CACHE_TTL = 30 * 24 * 60 * 60
+
+# Downloaded images are kept once, by content hash, in IMAGE_STORE_DIR
+# under CACHE_DIR and linked into each post that uses them. The store
+# itself isn't committed; image_index remembers which posts hold a copy,
+# so a fresh checkout can still materialize known images without a fetch.
+IMAGE_STORE_DIR = "images"
+
+# Images are streamed to disk in chunks and abandoned past MAX_IMAGE_BYTES
+MAX_IMAGE_BYTES = 50 * 1024 * 1024
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+# Within one issue, each image is downloaded once and shared by the blog and
+# every platform. Their bytes are kept in memory up to this budget; beyond
+# it they're re-read from disk when needed.
+IMAGE_ARTIFACT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# With --optimize-images, each image saved to the blog is recompressed and
+# capped at IMAGE_MAX_DIMENSION, with narrower copies at IMAGE_VARIANT_WIDTHS
+# for srcset. Results are kept in image_variant_index by the original's
+# content hash, so no image is optimized twice.
+IMAGE_MAX_DIMENSION = 2000
+IMAGE_VARIANT_WIDTHS = (480, 960, 1440)
+IMAGE_WEBP_QUALITY = 90
+IMAGE_OPTIMIZE_WORKERS = 4
+
+# What each platform accepts for an uploaded image. Anything bigger is
+# downsized and recompressed to fit before upload (see
+# prepare_image_for_platform); JPEG quality never drops below the minimum.
+PLATFORM_IMAGE_LIMITS = {
+    "bluesky": {"max_bytes": 1_000_000, "max_dimension": 2000},
+    "x": {"max_bytes": 5 * 1024 * 1024, "max_dimension": 4096},
+    "mastodon": {"max_bytes": 16 * 1024 * 1024, "max_dimension": 3840},
+}
+FIT_IMAGE_MIN_QUALITY = 40
+FIT_IMAGE_MAX_QUALITY = 95
+
+# Link card thumbnails are made from the page's og:image, scaled down to
+# fit LINK_CARD_THUMB_MAX_DIMENSION. Bluesky shows them well under that.
+LINK_CARD_THUMB_MAX_DIMENSION = 1000
+LINK_CARD_THUMB_QUALITY = 85
+
+# Each image saved to the blog gets a tiny WebP placeholder, inlined in its
+# frontmatter as a data URI for templates to paint while the image loads.
+PLACEHOLDER_MAX_DIMENSION = 16
+PLACEHOLDER_QUALITY = 40
+
+# How long an uploaded image can be reused in place of uploading it again,
+# before and after it's attached to a post (None: indefinitely; 0: never).
+# Mastodon deletes unattached media after a day and won't attach media
+# twice; X media IDs expire a day after upload; Bluesky collects blobs that
+# no record references, but referenced blobs can be used by any post.
+UPLOAD_REUSE_TTL = {
+    "mastodon": (24 * 60 * 60, 0),
+    "x": (24 * 60 * 60, 24 * 60 * 60),
+    "bluesky": (60 * 60, None),
+}
+
+# Parts of a thread are posted at least this many seconds apart. Beyond
+# that, each platform is paced by a token bucket of (requests, per seconds)
+# that its rate limit headers correct as responses come in. A wait longer
+# than RATE_LIMIT_MAX_WAIT defers the rest of the thread instead. Mastodon
+# allows 300 requests per 5 minutes; X, 100 posts per 15 minutes; Bluesky,
+# 5,000 points an hour at 3 points a post.
+POST_MIN_INTERVAL = 2
+RATE_LIMIT_MAX_WAIT = 60
+POST_RATE_LIMITS = {
+    "mastodon": (300, 5 * 60),
+    "x": (100, 15 * 60),
+    "bluesky": (1666, 60 * 60),
+}
+# Only headers from the (method, path) that creates posts correct the
+# buckets. Read endpoints like X's get_me or Bluesky's getAuthorFeed have
+# their own, smaller windows that say nothing about posting.
+POST_ENDPOINTS = {
+    "mastodon": ("POST", "/api/v1/statuses"),
+    "x": ("POST", "/2/tweets"),
+    "bluesky": ("POST", "/xrpc/com.atproto.repo.createRecord"),
+}
+
+# Before posting, a thread's first post is checked against fingerprints of
+# everything already published (see find_similar_post). Texts whose 64-bit
+# SimHashes differ in at most FINGERPRINT_MAX_DISTANCE bits count as the
+# same post. Our own posts are recorded as they go up; each platform's
+# timeline is read for anything posted by hand once the index for it is
+# FINGERPRINT_REFRESH_INTERVAL seconds old.
+FINGERPRINT_MAX_DISTANCE = 3
+FINGERPRINT_SHINGLE_WORDS = 3
+FINGERPRINT_REFRESH_INTERVAL = 24 * 60 * 60
+FINGERPRINT_TIMELINE_LIMIT = 40
+
+# Platform clients are made once per process (see get_client). Bluesky's
+# session is also saved between runs, in this file in CACHE_DIR. It's a
+# credential, so unlike the rest of the cache it's gitignored.
+BLUESKY_SESSION_FILE = "bluesky_session.txt"
+
+IMAGE_MIME_TYPES = {
+    ".avif": "image/avif",
+    ".gif": "image/gif",
+    ".jpeg": "image/jpeg",
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+
+# Query parameters that only track where a click came from. They're
+# stripped from URLs before caching and fetching, and links on these
+# shortener hosts are resolved once and remembered in redirect_cache.
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "gbraid",
+    "wbraid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "mkt_tok",
+    "ref_src",
+}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+SHORTENER_HOSTS = (
+    "wapo.st",
+    "bit.ly",
+    "buff.ly",
+    "dlvr.it",
+    "lnkd.in",
+    "nyti.ms",
+    "ow.ly",
+    "t.co",
+    "tinyurl.com",
+    "trib.al",
+)
+MAX_REDIRECTS = 10
+
+# Failed metadata fetches are remembered for NEGATIVE_CACHE_BASE_TTL,
+# doubling with each further failure up to NEGATIVE_CACHE_MAX_TTL. Within a
+# run, a domain that fails CIRCUIT_BREAKER_THRESHOLD times in a row is
+# skipped for CIRCUIT_BREAKER_COOLDOWN seconds.
+NEGATIVE_CACHE_BASE_TTL = 60 * 60
+NEGATIVE_CACHE_MAX_TTL = 7 * 24 * 60 * 60
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 10 * 60
+
+# Concurrency for link prefetching and image downloads: total workers, and
+# how many of them may hit any one host at the same time.
+METADATA_FETCH_WORKERS = 8
+IMAGE_DOWNLOAD_WORKERS = 4
+MAX_REQUESTS_PER_HOST = 2
+
+# Metadata lives in <head>, so stop reading a page there, or at this many
+# bytes for pages that never close it.
+METADATA_MAX_BYTES = 512 * 1024
+METADATA_CHUNK_SIZE = 16 * 1024
+
+_JSON_CACHES = []
+
+
+class JsonCache:
+    """
+    A JSON object stored in CACHE_DIR
 
-def get_url_metadata(url: str) -> Dict[str, Optional[str]]:
-    """Fetch metadata from a URL"""
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+    Loaded on first use and rewritten atomically on every change, so a crash
+    partway through a run never leaves a truncated file behind. Keys are
+    sorted and indented to keep diffs of the committed file readable.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._data = None
+        self._lock = threading.RLock()
+        _JSON_CACHES.append(self)
 
-        def find_meta(property=None, name=None):
-            tag = (
-                soup.find("meta", property=property)
-                if property
-                else soup.find("meta", attrs={"name": name})
+    @property
+    def path(self) -> str:
+        return os.path.join(CACHE_DIR, self.filename)
+
+    def _load(self) -> Dict:
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as e:
+                print(f"Error reading cache {self.path}, starting fresh: {e}")
+                self._data = {}
+        return self._data
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str):
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._load()[key] = value
+            self._save()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+
+    def values(self) -> List:
+        with self._lock:
+            return list(self._load().values())
+
+    def reset(self) -> None:
+        """Forget the loaded contents so the next access re-reads the file"""
+        with self._lock:
+            self._data = None
+
+
+class PublishJournal:
+    """
+    An append-only JSON Lines record of every post published, in CACHE_DIR
+
+    Each line is flushed to disk as soon as its post is up, so a run that
+    dies partway through a thread leaves a record of exactly which parts
+    made it. The next run replies to the last of them and carries on.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._entries = None
+        self._lock = threading.RLock()
+        _JSON_CACHES.append(self)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(CACHE_DIR, self.filename)
+
+    @staticmethod
+    def _key(issue: str, platform: str, thread_index: int, split_index: int) -> str:
+        return f"{issue}/{platform}/{thread_index}/{split_index}"
+
+    def _load(self) -> Dict[str, PublishJournalEntry]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A line cut short by a crash
+                            continue
+                        key = self._key(
+                            entry["issue"],
+                            entry["platform"],
+                            entry["thread_index"],
+                            entry["split_index"],
+                        )
+                        self._entries[key] = entry
+            except FileNotFoundError:
+                pass
+        return self._entries
+
+    def get(
+        self,
+        issue: Optional[str],
+        platform: str,
+        thread_index: int,
+        split_index: int,
+    ) -> Optional[PublishJournalEntry]:
+        if issue is None:
+            return None
+        with self._lock:
+            key = self._key(issue, platform, thread_index, split_index)
+            return self._load().get(key)
+
+    def has_published(self, issue: Optional[str], platform: str) -> bool:
+        """Whether any part of an issue's thread is up on a platform"""
+        if issue is None:
+            return False
+        with self._lock:
+            return any(
+                entry["issue"] == issue and entry["platform"] == platform
+                for entry in self._load().values()
             )
-            return tag.get("content") if tag else None
 
-        # Get title: og:title -> twitter:title -> <title>
-        title = (
-            find_meta(property="og:title")
-            or find_meta(name="twitter:title")
-            or (soup.find("title").text.strip() if soup.find("title") else None)
+    def record(
+        self,
+        issue: Optional[str],
+        platform: str,
+        thread_index: int,
+        split_index: int,
+        post_id: str,
+        cid: Optional[str] = None,
+    ) -> None:
+        """Record a published part. Posts without an issue aren't recorded."""
+        if issue is None:
+            return
+        entry: PublishJournalEntry = {
+            "issue": issue,
+            "platform": platform,
+            "thread_index": thread_index,
+            "split_index": split_index,
+            "post_id": post_id,
+            "cid": cid,
+            "published_at": time.time(),
+        }
+        with self._lock:
+            key = self._key(issue, platform, thread_index, split_index)
+            self._load()[key] = entry
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def reset(self) -> None:
+        """Forget the loaded entries so the next access re-reads the file"""
+        with self._lock:
+            self._entries = None
+
+
+def reset_caches() -> None:
+    """Reset every JsonCache and the publish journal, e.g. after pointing
+    CACHE_DIR somewhere else"""
+    for cache in _JSON_CACHES:
+        cache.reset()
+
+
+url_metadata_cache = JsonCache("url_metadata.json")
+url_failure_cache = JsonCache("url_failures.json")
+redirect_cache = JsonCache("redirects.json")
+image_index = JsonCache("image_index.json")
+image_variant_index = JsonCache("image_variants.json")
+platform_image_index = JsonCache("platform_images.json")
+image_manifest = JsonCache("image_manifest.json")
+upload_cache = JsonCache("uploads.json")
+link_thumbnail_index = JsonCache("link_thumbnails.json")
+image_placeholders = JsonCache("image_placeholders.json")
+publish_journal = PublishJournal("publish_journal.jsonl")
+fingerprint_index = JsonCache("fingerprints.json")
+fingerprint_refreshes = JsonCache("fingerprint_refreshes.json")
+identity_cache = JsonCache("identities.json")
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+class BoundedRetry(Retry):
+    """Retry that waits at most HTTP_BACKOFF_MAX for a Retry-After header"""
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, HTTP_BACKOFF_MAX)
+
+
+def build_http_session(
+    retries: int = HTTP_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR,
+    pool_size_per_host: int = HTTP_POOL_SIZE_PER_HOST,
+) -> requests.Session:
+    """Create a session with keep-alive pools per host and retries"""
+    retry = BoundedRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=pool_size_per_host,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Return the session shared by every outbound request in this process"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = build_http_session()
+        return _http_session
+
+
+def http_request(
+    method: str, url: str, timeout: float = HTTP_TIMEOUT, **kwargs
+) -> requests.Response:
+    """Make a request through the shared session with the standard timeout"""
+    return get_http_session().request(method, url, timeout=timeout, **kwargs)
+
+
+# The async API (get_url_metadata_async, download_image_async,
+# upload_media_to_mastodon_async) shares one httpx.AsyncClient per event
+# loop. The sync functions of the same names run those coroutines on a
+# background loop, so sync callers share its pool too.
+ASYNC_HTTP_TRANSPORT: Optional[httpx.AsyncBaseTransport] = None
+ASYNC_HTTP_MAX_CONNECTIONS = 100
+
+_async_http_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the AsyncClient for the running event loop, creating it if needed"""
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_HOSTS * HTTP_POOL_SIZE_PER_HOST,
+            ),
+            transport=ASYNC_HTTP_TRANSPORT,
         )
+        _async_http_clients[loop] = client
+    return client
 
-        # Get description: og:description -> twitter:description -> description
-        description = (
-            find_meta(property="og:description")
-            or find_meta(name="twitter:description")
-            or find_meta(name="description")
-        )
 
-        # Get preview image: og:image -> twitter:image
-        image = find_meta(property="og:image") or find_meta(name="twitter:image")
-        if image:
-            image = urljoin(url, image)
+def reset_async_http_clients() -> None:
+    """Drop every AsyncClient so the next request builds a fresh one"""
+    _async_http_clients.clear()
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    retry_after = response.headers.get("Retry-After") if response else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), HTTP_BACKOFF_MAX)
+    return min(HTTP_BACKOFF_FACTOR * (2**attempt), HTTP_BACKOFF_MAX)
+
+
+async def async_http_request(
+    method: str,
+    url: str,
+    timeout: float = HTTP_TIMEOUT,
+    stream: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Make a request through the shared AsyncClient, with the same timeout and
+    retry policy as http_request
+
+    With stream=True the body is left unread and the caller must
+    `await response.aclose()`.
+    """
+    client = get_async_http_client()
+    follow_redirects = kwargs.pop("follow_redirects", True)
+    idempotent = method.upper() in Retry.DEFAULT_ALLOWED_METHODS
+    attempts = HTTP_RETRIES + 1 if idempotent else 1
+
+    for attempt in range(attempts):
+        is_last_attempt = attempt == attempts - 1
+        request = client.build_request(method, url, timeout=timeout, **kwargs)
+        try:
+            response = await client.send(
+                request, stream=True, follow_redirects=follow_redirects
+            )
+        except httpx.TransportError:
+            if is_last_attempt:
+                raise
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+
+        if response.status_code in HTTP_RETRY_STATUSES and not is_last_attempt:
+            await response.aclose()
+            await asyncio.sleep(_retry_delay(attempt, response))
+            continue
 
-        return {"title": title, "description": description, "image": image}
+        if not stream:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return response
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                name="update-links-io",
+                daemon=True,
+            ).start()
+        return _background_loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared background event loop and wait for it"""
+    loop = _get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() can't be called from the background loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for use as a cache key"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (
+        scheme == "https" and netloc.endswith(":443")
+    ):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def strip_tracking_params(url: str) -> str:
+    """Remove TRACKING_PARAMS (and utm_*) from a URL's query string"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    query = [
+        (name, value)
+        for name, value in params
+        if name.lower() not in TRACKING_PARAMS
+        and not name.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    if len(query) == len(params):
+        return url
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of a URL (sync wrapper for canonicalize_url_async)"""
+    return run_sync(canonicalize_url_async(url))
+
+
+async def canonicalize_url_async(url: str) -> str:
+    """
+    Canonical form of a URL, used as the key for every cache and fetch
+
+    Normalizes the URL and strips tracking parameters. Links on
+    SHORTENER_HOSTS are resolved to their destination (itself
+    canonicalized) once, and the redirect chain is kept in redirect_cache.
+    If a short link can't be resolved, its normalized form is used.
+    """
+    canonical = strip_tracking_params(normalize_url(url))
+    if urlsplit(canonical).netloc not in SHORTENER_HOSTS:
+        return canonical
+
+    cached = redirect_cache.get(canonical)
+    if cached:
+        return cached["canonical"]
+
+    try:
+        chain = await resolve_redirects_async(canonical)
+    except Exception as e:
+        print(f"Error resolving short link {url}: {e}")
+        return canonical
+
+    resolved = strip_tracking_params(normalize_url(chain[-1]))
+    redirect_cache.set(
+        canonical,
+        {"canonical": resolved, "chain": chain, "resolved_at": time.time()},
+    )
+    return resolved
+
+
+async def resolve_redirects_async(url: str) -> List[str]:
+    """Follow redirects from a URL without downloading any bodies
+
+    Returns:
+        The chain of URLs visited, ending with the final destination
+    """
+    chain = [url]
+    for _ in range(MAX_REDIRECTS):
+        response = await async_http_request("HEAD", chain[-1], follow_redirects=False)
+        if response.status_code in (403, 405, 501):
+            # Some servers refuse HEAD; a streamed GET stops after the headers
+            response = await async_http_request(
+                "GET", chain[-1], follow_redirects=False, stream=True
+            )
+            await response.aclose()
+        location = response.headers.get("Location")
+        if not response.is_redirect or not location:
+            # Past the shortener, where we landed matters more than how the
+            # destination answers a bot's HEAD request
+            if len(chain) == 1:
+                response.raise_for_status()
+            return chain
+        chain.append(urljoin(chain[-1], location))
+    raise httpx.TooManyRedirects(f"More than {MAX_REDIRECTS} redirects from {url}")
+
+
+def get_url_metadata(url: str) -> Dict[str, Optional[str]]:
+    """Fetch metadata from a URL (sync wrapper for get_url_metadata_async)"""
+    return run_sync(get_url_metadata_async(url))
+
+
+async def get_url_metadata_async(url: str) -> Dict[str, Optional[str]]:
+    """
+    Fetch metadata from a URL
+
+    Known hosts are served by METADATA_RESOLVERS, falling back to scraping
+    the page. Everything is keyed and fetched by the URL's canonical form.
+    Results are kept in url_metadata_cache for METADATA_CACHE_TTL.
+    Stale entries are revalidated with a conditional request, and are still
+    used if that request fails.
+    """
+    local = await resolve_local_metadata_async(url)
+    if local is not None:
+        return local
+
+    key = await canonicalize_url_async(url)
+    cached = url_metadata_cache.get(key)
+    if cached and time.time() - cached.get("fetched_at", 0) < METADATA_CACHE_TTL:
+        return _metadata_from_entry(cached)
+
+    fallback = _metadata_from_entry(cached) if cached else {}
+    failure = url_failure_cache.get(key)
+    if failure and time.time() < failure["retry_at"]:
+        _record_metadata_skip("negative_cache")
+        return fallback
+    domain = urlsplit(key).netloc
+    if circuit_is_open(domain):
+        _record_metadata_skip("circuit_open")
+        return fallback
+
+    try:
+        entry = await resolve_url_metadata_async(key, cached)
     except Exception as e:
         print(f"Error fetching metadata for {url}: {e}")
+        record_metadata_failure(key, e)
+        return fallback
+
+    record_metadata_success(key)
+    url_metadata_cache.set(key, entry)
+    return _metadata_from_entry(entry)
+
+
+_circuit_breakers: Dict[str, Dict[str, float]] = {}
+_metadata_failure_stats: Dict[str, Dict[str, int]] = {
+    "failures": {},
+    "skipped": {"negative_cache": 0, "circuit_open": 0},
+}
+_failure_lock = threading.Lock()
+
+
+def circuit_is_open(domain: str) -> bool:
+    """Check whether requests to a domain are currently being short-circuited
+
+    Once the cool-down has passed, the next request is let through as a
+    trial; another failure re-opens the circuit straight away.
+    """
+    with _failure_lock:
+        breaker = _circuit_breakers.get(domain)
+        return bool(breaker and time.time() < breaker["open_until"])
+
+
+def record_metadata_failure(key: str, error: Exception) -> None:
+    """Add a failure to the negative cache and the domain's circuit breaker"""
+    now = time.time()
+    previous = url_failure_cache.get(key)
+    failures = previous["failures"] + 1 if previous else 1
+    ttl = min(NEGATIVE_CACHE_BASE_TTL * 2 ** (failures - 1), NEGATIVE_CACHE_MAX_TTL)
+    url_failure_cache.set(
+        key,
+        {
+            "failures": failures,
+            "error": str(error)[:200],
+            "failed_at": now,
+            "retry_at": now + ttl,
+        },
+    )
+
+    domain = urlsplit(key).netloc
+    with _failure_lock:
+        counts = _metadata_failure_stats["failures"]
+        counts[domain] = counts.get(domain, 0) + 1
+
+        breaker = _circuit_breakers.setdefault(
+            domain, {"consecutive": 0, "open_until": 0}
+        )
+        breaker["consecutive"] += 1
+        if breaker["consecutive"] >= CIRCUIT_BREAKER_THRESHOLD:
+            breaker["open_until"] = now + CIRCUIT_BREAKER_COOLDOWN
+            print(
+                f"Circuit open for {domain} after {breaker['consecutive']} "
+                f"consecutive failures; skipping it for {CIRCUIT_BREAKER_COOLDOWN}s"
+            )
+
+
+def record_metadata_success(key: str) -> None:
+    """Clear a URL's negative cache entry and close its domain's circuit"""
+    url_failure_cache.delete(key)
+    with _failure_lock:
+        _circuit_breakers.pop(urlsplit(key).netloc, None)
+
+
+def _record_metadata_skip(reason: str) -> None:
+    with _failure_lock:
+        _metadata_failure_stats["skipped"][reason] += 1
+
+
+def print_metadata_failure_summary() -> None:
+    """Print this run's metadata fetch failures and skipped fetches"""
+    with _failure_lock:
+        failures = dict(_metadata_failure_stats["failures"])
+        skipped = dict(_metadata_failure_stats["skipped"])
+    if not failures and not any(skipped.values()):
+        return
+
+    print("\nLink metadata failures:")
+    for domain, count in sorted(failures.items(), key=lambda item: -item[1]):
+        state = " (circuit open)" if circuit_is_open(domain) else ""
+        print(f"  {domain}: {count} failure(s){state}")
+    print(
+        f"  Skipped {skipped['negative_cache']} fetch(es) from the negative cache"
+        f" and {skipped['circuit_open']} for open circuits"
+    )
+
+
+def reset_metadata_failure_stats() -> None:
+    """Forget this process's circuit breakers and failure counts"""
+    with _failure_lock:
+        _circuit_breakers.clear()
+        _metadata_failure_stats["failures"].clear()
+        for reason in _metadata_failure_stats["skipped"]:
+            _metadata_failure_stats["skipped"][reason] = 0
+
+
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """Return the semaphore limiting concurrent requests to this URL's host"""
+    host = urlsplit(url).netloc.lower()
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+        return _host_semaphores[host]
+
+
+def prefetch_url_metadata(urls: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Fetch metadata for many URLs concurrently
+
+    Each distinct URL is fetched once, on a pool of METADATA_FETCH_WORKERS
+    threads with at most MAX_REQUESTS_PER_HOST in flight per host.
+
+    Returns:
+        Dict mapping each URL to its get_url_metadata result
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
         return {}
 
+    def fetch(url: str) -> Dict[str, Optional[str]]:
+        with host_semaphore(url):
+            return get_url_metadata(url)
+
+    workers = min(METADATA_FETCH_WORKERS, len(unique_urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique_urls, executor.map(fetch, unique_urls)))
+
+
+def _metadata_from_entry(entry: UrlMetadataEntry) -> Dict[str, Optional[str]]:
+    return {
+        "title": entry.get("title"),
+        "description": entry.get("description"),
+        "image": entry.get("image"),
+    }
+
+
+def accepted_encodings() -> str:
+    """Build an Accept-Encoding header from the codecs that can be decoded here"""
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard"):
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+async def read_html_head(
+    chunks: AsyncIterator[bytes], max_bytes: int = METADATA_MAX_BYTES
+) -> bytes:
+    """Read an HTML body from chunks until </head> or max_bytes, whichever is first"""
+    body = bytearray()
+    async for chunk in chunks:
+        # Overlap the search with the previous chunk in case the tag is split
+        search_from = max(len(body) - len("</head>"), 0)
+        body.extend(chunk)
+        end = body.lower().find(b"</head>", search_from)
+        if end != -1:
+            return bytes(body[: end + len("</head>")])
+        if len(body) >= max_bytes:
+            return bytes(body[:max_bytes])
+    return bytes(body)
+
+
+def sniff_charset(content_type: Optional[str], head: bytes) -> str:
+    """Find a page's charset from its Content-Type header or <meta> tags"""
+    candidates = []
+    if content_type:
+        match = re.search(r"charset=[\"']?([\w.:-]+)", content_type, re.IGNORECASE)
+        if match:
+            candidates.append(match.group(1))
+    match = re.search(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", head, re.IGNORECASE)
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+class _HeadEnded(Exception):
+    pass
+
+
+class MetaTagParser(HTMLParser):
+    """
+    Collect <meta> tags and the <title> from an HTML document in one pass
+
+    Stops at </head> (or <body>, for pages that never close their head) by
+    raising _HeadEnded out of feed(). Like BeautifulSoup's find(), only the
+    first tag for each property/name counts.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.properties: Dict[str, Optional[str]] = {}
+        self.names: Dict[str, Optional[str]] = {}
+        self.title: Optional[str] = None
+        self._title_parts: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            if "property" in attrs:
+                self.properties.setdefault(attrs["property"], attrs.get("content"))
+            if "name" in attrs:
+                self.names.setdefault(attrs["name"], attrs.get("content"))
+        elif tag == "title" and self.title is None:
+            self._title_parts = []
+        elif tag == "body":
+            raise _HeadEnded()
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+        elif tag == "head":
+            raise _HeadEnded()
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+
+def extract_html_metadata(html: str, url: str) -> Dict[str, Optional[str]]:
+    """Extract title, description and preview image from an HTML document"""
+    parser = MetaTagParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _HeadEnded:
+        pass
+
+    # Get title: og:title -> twitter:title -> <title>
+    title = (
+        parser.properties.get("og:title")
+        or parser.names.get("twitter:title")
+        or parser.title
+    )
+
+    # Get description: og:description -> twitter:description -> description
+    description = (
+        parser.properties.get("og:description")
+        or parser.names.get("twitter:description")
+        or parser.names.get("description")
+    )
+
+    # Get preview image: og:image -> twitter:image
+    image = parser.properties.get("og:image") or parser.names.get("twitter:image")
+    if image:
+        image = urljoin(url, image)
+
+    return {"title": title, "description": description, "image": image}
+
+
+async def fetch_url_metadata_async(
+    url: str, cached: Optional[UrlMetadataEntry] = None
+) -> UrlMetadataEntry:
+    """
+    Fetch a page and extract its metadata
+
+    When a previously cached entry is passed in, the request is made
+    conditional on its ETag/Last-Modified, and a 304 refreshes that entry
+    instead of re-downloading the page. Raises on request failure.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": accepted_encodings(),
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1"
+    }
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    # Stream the body so only <head> is downloaded and decoded, not the
+    # whole (often multi-megabyte) article
+    response = await async_http_request("GET", url, headers=headers, stream=True)
+    try:
+        if cached and response.status_code == 304:
+            return {**cached, "fetched_at": time.time()}
+        response.raise_for_status()
+        head = await read_html_head(response.aiter_bytes(METADATA_CHUNK_SIZE))
+        charset = sniff_charset(response.headers.get("Content-Type"), head)
+    finally:
+        await response.aclose()
+
+    metadata = extract_html_metadata(head.decode(charset, errors="replace"), url)
+
+    return {
+        **metadata,
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+MetadataResolver = Callable[[str], Awaitable[Optional[Dict[str, Optional[str]]]]]
+
+# (hosts, resolver, cacheable) in registration order. A resolver returns
+# metadata for a URL, or None to fall through to the next resolver and
+# finally to scraping the page's HTML.
+METADATA_RESOLVERS: List[Tuple[Tuple[str, ...], MetadataResolver, bool]] = []
+
+
+def metadata_resolver(*hosts: str, cache: bool = True):
+    """Register an async metadata resolver for URLs on these hosts
+
+    Resolvers registered with cache=False are consulted before
+    url_metadata_cache, for sources that are cheaper than the cache.
+    """
+
+    def register(resolver: MetadataResolver) -> MetadataResolver:
+        METADATA_RESOLVERS.append((hosts, resolver, cache))
+        return resolver
+
+    return register
+
+
+def _resolvers_for(url: str, cacheable: bool) -> List[MetadataResolver]:
+    host = urlsplit(url).netloc.lower()
+    return [
+        resolver
+        for hosts, resolver, cache in METADATA_RESOLVERS
+        if host in hosts and cache == cacheable
+    ]
+
+
+async def resolve_local_metadata_async(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Run the uncached resolvers for a URL"""
+    for resolver in _resolvers_for(url, cacheable=False):
+        metadata = await resolver(url)
+        if metadata is not None:
+            return metadata
+    return None
+
+
+async def resolve_url_metadata_async(
+    url: str, cached: Optional[UrlMetadataEntry] = None
+) -> UrlMetadataEntry:
+    """Get metadata from the first matching resolver, or by scraping the page
+
+    A resolver that fails is skipped, so the page is still scraped.
+    """
+    for resolver in _resolvers_for(url, cacheable=True):
+        try:
+            metadata = await resolver(url)
+        except Exception as e:
+            print(f"Error resolving metadata for {url}, scraping instead: {e}")
+            continue
+        if metadata is not None:
+            return {**metadata, "fetched_at": time.time()}
+    return await fetch_url_metadata_async(url, cached)
 
-def create_bluesky_link_card(url: str, client: Optional[Client] = None) -> Optional[Dict]:
+
+async def _get_json(url: str, **kwargs) -> Dict:
+    response = await async_http_request("GET", url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+@metadata_resolver("youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be")
+async def resolve_youtube_metadata(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Videos, via YouTube's oEmbed endpoint (which has no description, so
+    the channel name stands in); channels etc. are scraped"""
+    parts = urlsplit(url)
+    if parts.netloc == "youtu.be":
+        is_video = re.match(r"^/[\w-]+/?$", parts.path)
+    else:
+        is_video = (parts.path == "/watch" and "v=" in parts.query) or re.match(
+            r"^/shorts/[\w-]+/?$", parts.path
+        )
+    if not is_video:
+        return None
+
+    data = await _get_json(
+        YOUTUBE_OEMBED_ENDPOINT, params={"url": url, "format": "json"}
+    )
+    return {
+        "title": data.get("title"),
+        "description": data.get("author_name"),
+        "image": data.get("thumbnail_url"),
+    }
+
+
+@metadata_resolver("bsky.app")
+async def resolve_bluesky_metadata(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Posts, via Bluesky's oEmbed endpoint; profiles etc. are scraped"""
+    if not re.match(r"^/profile/[^/]+/post/[^/]+/?$", urlsplit(url).path):
+        return None
+
+    data = await _get_json(BLUESKY_OEMBED_ENDPOINT, params={"url": url})
+    # The post text is the first paragraph of the embed's blockquote
+    paragraph = re.search(r"<p[^>]*>(.*?)</p>", data.get("html", ""), re.DOTALL)
+    text = re.sub("<[^<]+?>", "", paragraph.group(1)).strip() if paragraph else None
+    return {
+        "title": data.get("author_name"),
+        "description": html_unescape(text) if text else None,
+        "image": None,
+    }
+
+
+# First path segments on github.com that aren't users or organizations
+GITHUB_RESERVED_PATHS = {
+    "about",
+    "collections",
+    "enterprise",
+    "events",
+    "explore",
+    "features",
+    "marketplace",
+    "orgs",
+    "pricing",
+    "settings",
+    "sponsors",
+    "topics",
+    "trending",
+}
+
+
+@metadata_resolver("github.com", "www.github.com")
+async def resolve_github_metadata(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Repositories, via the GitHub REST API; other pages are scraped"""
+    match = re.match(r"^/([\w.-]+)/([\w.-]+)/?$", urlsplit(url).path)
+    if not match or match.group(1).lower() in GITHUB_RESERVED_PATHS:
+        return None
+
+    owner, repo = match.groups()
+    headers = {"Accept": "application/vnd.github+json"}
+    if os.environ.get("GITHUB_TOKEN"):
+        headers["Authorization"] = f"token {os.environ['GITHUB_TOKEN']}"
+    data = await _get_json(
+        f"{GITHUB_API_ENDPOINT}/repos/{quote(owner)}/{quote(repo)}", headers=headers
+    )
+    full_name = data.get("full_name", f"{owner}/{repo}")
+    description = data.get("description")
+    return {
+        # Same format as the og:title GitHub serves for repo pages
+        "title": f"GitHub - {full_name}: {description}"
+        if description
+        else f"GitHub - {full_name}",
+        "description": description,
+        "image": f"https://opengraph.githubassets.com/1/{full_name}",
+    }
+
+
+@metadata_resolver(*SITE_HOSTS, cache=False)
+async def resolve_site_metadata(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Our own pages, read from content/ frontmatter with no network"""
+    path = find_local_content(url)
+    if not path:
+        return None
+
+    frontmatter, body = read_frontmatter(path)
+    title = frontmatter.get("title")
+    if not title and "/link/" in path.replace(os.sep, "/"):
+        # Mirrors the link page template
+        title = "Short post"
+    return {
+        "title": title or None,
+        "description": frontmatter.get("blurb") or summarize_markdown(body) or None,
+        "image": SITE_IMAGE,
+    }
+
+
+_local_content_index: Optional[Dict[Tuple[str, str], str]] = None
+_local_content_lock = threading.Lock()
+
+
+def find_local_content(url: str) -> Optional[str]:
+    """Find the content/ Markdown file for one of our URLs
+
+    Matches the last path segment against each entry's slug (frontmatter
+    `slug`, else its directory or file name), within the URL's section.
+    """
+    global _local_content_index
+    with _local_content_lock:
+        if _local_content_index is None:
+            _local_content_index = _build_local_content_index()
+        index = _local_content_index
+
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    if not segments:
+        return None
+    section = segments[0] if len(segments) > 1 else "page"
+    return index.get((section, urlize(segments[-1])))
+
+
+def _build_local_content_index() -> Dict[Tuple[str, str], str]:
+    index = {}
+    for root, _, files in os.walk(CONTENT_DIR):
+        for name in files:
+            if not name.endswith(".md") or name == "_index.md":
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, CONTENT_DIR).replace(os.sep, "/")
+            entry_id = re.sub(r"(/index)?\.md$", "", relative)
+            if "/" in entry_id:
+                section, entry_id = entry_id.split("/", 1)
+            else:
+                section = "page"
+            frontmatter, _ = read_frontmatter(path)
+            slug = frontmatter.get("slug") or entry_id
+            index[(section, urlize(slug))] = path
+    return index
+
+
+def reset_local_content_index() -> None:
+    """Forget the content/ index, e.g. after a new post is saved"""
+    global _local_content_index
+    with _local_content_lock:
+        _local_content_index = None
+
+
+def read_frontmatter(path: str) -> Tuple[Dict[str, str], str]:
+    """Read a Markdown file's top-level scalar frontmatter fields and body"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    match = re.match(r"^---\n(.*?)\n---\n?(.*)$", text, re.DOTALL)
+    if not match:
+        return {}, text
+
+    fields = {}
+    for line in match.group(1).split("\n"):
+        field = re.match(r"^([\w-]+):\s*(.*?)\s*$", line)
+        if field and field.group(2):
+            value = field.group(2)
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            fields[field.group(1)] = value
+    return fields, match.group(2)
+
+
+def urlize(s: str) -> str:
+    """Hugo's urlize, as used for slugs: lowercase, whitespace to hyphens"""
+    return re.sub(r"\s+", "-", s.lower())
+
+
+def summarize_markdown(md: str, words: int = 70) -> str:
+    """Plain-text summary of Markdown, like src/lib/text.ts summarize()"""
+    text = re.sub(r"```[\s\S]*?```", " ", md)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"!\[[^\]]*\]\([^)]*\)", " ", text)
+    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"[#*_`>]", "", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{2,}", "\n", text).strip()
+    return " ".join(text.split()[:words])
+
+
+def create_bluesky_link_card(
+    url: str,
+    client: Optional[Client] = None,
+    uploads: Optional[List[Tuple[str, Optional[str]]]] = None,
+) -> Optional[Dict]:
     """Create a Bluesky external link embed from URL metadata, including a
     thumbnail image when one is available, matching the card Bluesky itself
-    generates when a link is posted directly through the app."""
+    generates when a link is posted directly through the app.
+
+    The thumbnail's (hash, alt) is appended to uploads, for
+    mark_uploads_attached once the post is sent.
+    """
     metadata = get_url_metadata(url)
     if not metadata.get("title"):
         return None
@@ -109,10 +1449,18 @@ def create_bluesky_link_card(url: str, client: Optional[Client] = None) -> Optio
     image_url = metadata.get("image")
     if image_url and client is not None:
         try:
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            upload_response = client.upload_blob(response.content)
-            external["thumb"] = upload_response.blob
+            thumbnail = get_link_card_thumbnail(url, image_url)
+            blob = cached_upload(
+                "bluesky",
+                thumbnail["sha256"],
+                None,
+                lambda: client.upload_blob(
+                    read_link_card_thumbnail(url, image_url, thumbnail)
+                ).blob.model_dump(mode="json", by_alias=True),
+            )
+            external["thumb"] = models.blob_ref.BlobRef.model_validate(blob)
+            if uploads is not None:
+                uploads.append((thumbnail["sha256"], None))
         except Exception as e:
             print(f"Error uploading Bluesky link card thumbnail {image_url}: {e}")
 
@@ -122,20 +1470,184 @@ def create_bluesky_link_card(url: str, client: Optional[Client] = None) -> Optio
     }
 
 
-def download_images_for_post(post: Post, post_dir: str) -> List[str]:
-    """Download images for a post and return list of local paths"""
+def get_link_card_thumbnail(url: str, image_url: str) -> LinkThumbnailEntry:
+    """
+    The link card thumbnail for a page, made from its og:image
+
+    Thumbnails are recorded in link_thumbnail_index by the page's canonical
+    URL, and remade only when its og:image changes. The thumbnail file
+    itself may not be present; read it with read_link_card_thumbnail.
+    """
+    key = canonicalize_url(url)
+    entry = link_thumbnail_index.get(key)
+    if entry and entry["image"] == canonicalize_url(image_url):
+        return entry
+    return build_link_card_thumbnail(url, image_url)
+
+
+def read_link_card_thumbnail(
+    url: str, image_url: str, entry: LinkThumbnailEntry
+) -> bytes:
+    """A link card thumbnail's bytes, remaking it if the file is gone"""
+    path = find_stored_image(entry)
+    if path is None:
+        entry = build_link_card_thumbnail(url, image_url)
+        path = image_store_path(entry)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def build_link_card_thumbnail(url: str, image_url: str) -> LinkThumbnailEntry:
+    """Fetch an og:image into the image store (once; see store_image_async)
+    and scale it down to a link card thumbnail"""
+    image_key, source = run_sync(store_image_async(image_url))
+
+    with Image.open(image_store_path(source)) as img:
+        size = (LINK_CARD_THUMB_MAX_DIMENSION, LINK_CARD_THUMB_MAX_DIMENSION)
+        # draft decodes JPEGs at reduced scale, so only the scaled-down
+        # image is ever held in memory
+        img.draft("RGB", size)
+        img.thumbnail(size, Image.LANCZOS)
+        buffer = io.BytesIO()
+        flatten_to_rgb(img).save(
+            buffer, format="JPEG", quality=LINK_CARD_THUMB_QUALITY, optimize=True
+        )
+    data = buffer.getvalue()
+
+    entry = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "ext": ".jpg",
+        "size": len(data),
+        "paths": [],
+        "image": image_key,
+    }
+    store_image_bytes(data, entry)
+    link_thumbnail_index.set(canonicalize_url(url), entry)
+    return entry
+
+
+class ImageArtifact:
+    """
+    An image downloaded for this issue, shared by the blog and every platform
+
+    `path` is its file in the content-addressed store, which stays put even
+    if a post's copy is replaced; `read()` returns its bytes, held in memory
+    while IMAGE_ARTIFACT_MEMORY_BUDGET allows.
+    """
+
+    def __init__(self, url: str, path: str):
+        self.url = url
+        self.path = path
+        self._data: Optional[bytes] = None
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    def read(self) -> bytes:
+        global _image_artifact_memory_used
+        if self._data is not None:
+            return self._data
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with _image_artifacts_lock:
+            if _image_artifact_memory_used + len(data) <= IMAGE_ARTIFACT_MEMORY_BUDGET:
+                _image_artifact_memory_used += len(data)
+                self._data = data
+        return data
+
+
+# Each URL's download, as a Future so concurrent consumers wait for it
+_image_artifacts: Dict[str, Future] = {}
+_image_artifacts_lock = threading.Lock()
+_image_artifact_memory_used = 0
+
+
+def get_image_artifact(
+    image_url: str, dest_path: Optional[str] = None
+) -> Optional[ImageArtifact]:
+    """
+    The artifact for an image, downloading it into dest_path on first use
+
+    Consumers that only read the image, like the social platforms, pass no
+    dest_path and use the stored copy. That way a blog post whose copy was
+    replaced by optimized ones (see optimize_post_images) doesn't get the
+    original back.
+
+    Later requests for the same URL, from any consumer, reuse the first
+    download (linking it into dest_path if needed), waiting for it if it's
+    still in progress. Failed downloads aren't retried within the run.
+    """
+    with _image_artifacts_lock:
+        future = _image_artifacts.get(image_url)
+        downloading = future is None
+        if downloading:
+            future = _image_artifacts[image_url] = Future()
+
+    if not downloading:
+        artifact = future.result()
+        if artifact is not None and dest_path is not None:
+            materialize_image(artifact.path, dest_path)
+        return artifact
+
+    artifact = None
+    try:
+        filename = download_image(image_url, dest_path)
+        if filename:
+            artifact = ImageArtifact(
+                image_url, os.path.join(CACHE_DIR, IMAGE_STORE_DIR, filename)
+            )
+    finally:
+        future.set_result(artifact)
+    return artifact
+
+
+def get_post_image_artifacts(
+    post: Post, post_dir: Optional[str] = None
+) -> List[Optional[ImageArtifact]]:
+    """
+    Artifacts for every image in a post, downloaded concurrently (into
+    post_dir, if given; see get_image_artifact)
+
+    Downloads run on a pool of IMAGE_DOWNLOAD_WORKERS threads with at most
+    MAX_REQUESTS_PER_HOST in flight per host.
+
+    Returns:
+        One entry per post["images"], in the same order, with None for
+        images that couldn't be downloaded
+    """
     if not post.get("images"):
         return []
 
-    os.makedirs(post_dir, exist_ok=True)
-    image_paths = []
+    if post_dir is not None:
+        os.makedirs(post_dir, exist_ok=True)
+    urls = [image_info["src"] for image_info in post["images"]]
 
-    for image_info in post["images"]:
-        filename = download_image(image_info["src"], post_dir)
-        if filename:
-            image_paths.append(os.path.join(post_dir, filename))
+    def fetch(url: str) -> Optional[ImageArtifact]:
+        with host_semaphore(url):
+            return get_image_artifact(url, post_dir)
 
-    return image_paths
+    workers = min(IMAGE_DOWNLOAD_WORKERS, len(urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch, urls))
+
+
+def reset_image_artifacts() -> None:
+    """Forget this issue's artifacts and release their memory"""
+    global _image_artifact_memory_used
+    with _image_artifacts_lock:
+        _image_artifacts.clear()
+        _image_artifact_memory_used = 0
+
+
+def download_images_for_post(post: Post, post_dir: str) -> List[str]:
+    """Download images for a post and return list of local paths"""
+    return [
+        os.path.join(post_dir, artifact.filename)
+        for artifact in get_post_image_artifacts(post, post_dir)
+        if artifact
+    ]
 
 
 def build_bluesky_text_with_links(
@@ -210,11 +1722,20 @@ def process_issue_text(text: str) -> tuple[str, List[ImageInfo]]:
     for img_tag in img_tags:
         src_match = re.search(r'src=["\']([^"\']+)["\']', img_tag, re.IGNORECASE)
         alt_match = re.search(r'alt=["\']([^"\']*)["\']', img_tag, re.IGNORECASE)
+        # Only plain pixel sizes; "50%" or "10em" say nothing about the image
+        width_match = re.search(r'\bwidth=["\']?(\d+)["\'\s/>]', img_tag, re.IGNORECASE)
+        height_match = re.search(
+            r'\bheight=["\']?(\d+)["\'\s/>]', img_tag, re.IGNORECASE
+        )
 
         if src_match:
             src_url = src_match.group(1)
             alt_text = alt_match.group(1) if alt_match else None
-            images.append({"src": src_url, "alt": alt_text})
+            image = {"src": src_url, "alt": alt_text}
+            if width_match and height_match:
+                image["width"] = int(width_match.group(1))
+                image["height"] = int(height_match.group(1))
+            images.append(image)
     cleaned_text = re.sub(r"<img[^>]*>", "", cleaned_text, flags=re.IGNORECASE)
 
     github_assets_pattern = (
@@ -251,93 +1772,620 @@ def process_issue_text_for_blog(text: str, url_to_filename: Dict[str, str]) -> s
     if not text:
         return text
 
-    result = text
+    result = text
+
+    # Replace image URLs with local filenames
+    for url, local_filename in url_to_filename.items():
+        result = result.replace(url, local_filename)
+
+    # Convert plain URLs to titled links for blog posts
+    # Match URLs that aren't already in markdown link format
+    url_pattern = r'(?<!\]\()https?://[^\s)]+(?!\))'
+
+    def clean_url(url: str) -> str:
+        # Clean up any trailing punctuation
+        return re.sub(r'[.,;:!?]+$', '', url)
+
+    # Fetch metadata for every URL up front, concurrently, rather than one
+    # at a time from inside the substitution
+    metadata_by_url = prefetch_url_metadata(
+        [clean_url(match.group(0)) for match in re.finditer(url_pattern, result)]
+    )
+
+    def replace_with_titled_link(match):
+        url = clean_url(match.group(0))
+        title = metadata_by_url[url].get('title')
+
+        if title:
+            return f"\n\n[{title}]({url})"
+        else:
+            # If we can't get a title, keep the plain URL
+            return url
+
+    result = re.sub(url_pattern, replace_with_titled_link, result)
+    return result
+
+
+def extract_images_from_issue(issue_body: str) -> List[str]:
+    """Extract image URLs from GitHub issue markdown content (legacy function)"""
+    _, images = process_issue_text(issue_body)
+    return [img["src"] for img in images]
+
+
+def remove_images_from_text(text: str) -> str:
+    """Remove image HTML and markdown from text content (legacy function)"""
+    cleaned_text, _ = process_issue_text(text)
+    return cleaned_text
+
+
+def download_image(image_url: str, dest_path: Optional[str] = None) -> Optional[str]:
+    """Download an image and save it to the specified path (sync wrapper for
+    download_image_async)"""
+    return run_sync(download_image_async(image_url, dest_path))
+
+
+async def download_image_async(
+    image_url: str, dest_path: Optional[str] = None
+) -> Optional[str]:
+    """
+    Download an image and save it to the specified path
+
+    Images are stored by content hash (see IMAGE_STORE_DIR). One whose URL
+    is already in image_index is linked into dest_path from an existing
+    copy without any network I/O. With no dest_path, the image is only put
+    in the store.
+
+    Returns:
+        The image's filename within dest_path (and the store), or None on
+        failure
+    """
+    try:
+        key, entry = await store_image_async(image_url)
+        if dest_path is None:
+            return os.path.basename(image_store_path(entry))
+        filename = materialize_image(image_store_path(entry), dest_path)
+        remember_image_copy(key, entry, os.path.join(dest_path, filename))
+        return filename
+    except Exception as e:
+        print(f"Error downloading image {image_url}: {e}")
+        return None
+
+
+async def store_image_async(image_url: str) -> Tuple[str, ImageIndexEntry]:
+    """
+    Make sure an image is in the content-addressed store
+
+    Images already in image_index are taken from an existing copy; others
+    are downloaded.
+
+    Returns:
+        (the image's canonical URL, its image_index entry)
+    """
+    key = await canonicalize_url_async(image_url)
+    entry = image_index.get(key)
+    source = find_stored_image(entry) if entry else None
+
+    if source is None:
+        entry = await fetch_image_to_store_async(image_url)
+        # Recorded now so images that never reach a post are remembered too
+        image_index.set(key, entry)
+    elif source != image_store_path(entry):
+        # Put a post's copy back in the store, so the rest of the run
+        # doesn't depend on that copy staying where it is
+        materialize_image(source, os.path.dirname(image_store_path(entry)))
+    return key, entry
+
+
+async def fetch_image_to_store_async(image_url: str) -> ImageIndexEntry:
+    """
+    Stream an image into the content-addressed store
+
+    Chunks go to a temp file while the SHA-256 is computed, so only one
+    chunk is in memory at a time. Downloads over MAX_IMAGE_BYTES are
+    abandoned. The file is renamed to its content-addressed name once
+    complete, so the store never holds a partial image.
+
+    Returns:
+        The new image_index entry (with no copies in posts yet)
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        "Authorization": (
+            f"token {os.environ.get('GITHUB_TOKEN', '')}"
+            if "github" in image_url
+            else None
+        ),
+    }
+    headers = {k: v for k, v in headers.items() if v is not None}
+
+    tmp_path = None
+    response = await async_http_request(
+        "GET", image_url, headers=headers, timeout=30, stream=True
+    )
+    try:
+        response.raise_for_status()
+        declared_size = int(response.headers.get("content-length") or 0)
+        if declared_size > MAX_IMAGE_BYTES:
+            raise ValueError(
+                f"Image is {declared_size} bytes, over the {MAX_IMAGE_BYTES} byte limit"
+            )
+
+        store_dir = os.path.join(CACHE_DIR, IMAGE_STORE_DIR)
+        os.makedirs(store_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=store_dir, suffix=".tmp")
+
+        sha256 = hashlib.sha256()
+        size = 0
+        head = b""
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in response.aiter_bytes(IMAGE_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise ValueError(f"Image is over the {MAX_IMAGE_BYTES} byte limit")
+                if len(head) < 32:
+                    head += chunk[: 32 - len(head)]
+                sha256.update(chunk)
+                f.write(chunk)
+
+        entry: ImageIndexEntry = {
+            "sha256": sha256.hexdigest(),
+            "ext": sniff_image_extension(
+                head, image_url, response.headers.get("content-type")
+            ),
+            "size": size,
+            "paths": [],
+        }
+        os.replace(tmp_path, image_store_path(entry))
+        return entry
+    finally:
+        await response.aclose()
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def sniff_image_extension(
+    head: bytes, image_url: str = "", content_type: Optional[str] = None
+) -> str:
+    """
+    File extension for an image, from its first bytes
+
+    Formats without a recognizable signature fall back to the URL's
+    extension, then the Content-Type, then .jpg.
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return ".avif"
+
+    filename = image_url.split("/")[-1]
+    if "." in filename:
+        return "." + filename.split(".")[-1].split("?")[0]
+    if content_type:
+        if "jpeg" in content_type or "jpg" in content_type:
+            return ".jpg"
+        elif "png" in content_type:
+            return ".png"
+        elif "gif" in content_type:
+            return ".gif"
+        elif "webp" in content_type:
+            return ".webp"
+    return ".jpg"
+
+
+def image_store_path(entry: ImageIndexEntry) -> str:
+    """Where an image lives in the content-addressed store"""
+    return os.path.join(CACHE_DIR, IMAGE_STORE_DIR, f"{entry['sha256']}{entry['ext']}")
+
+
+def find_stored_image(entry: ImageIndexEntry) -> Optional[str]:
+    """A local copy of an indexed image: from the store, or from any post
+    it was saved to. Copies are matched by their hash-derived filename and
+    size."""
+    filename = f"{entry['sha256']}{entry['ext']}"
+    candidates = [image_store_path(entry)] + [
+        path for path in entry.get("paths", []) if os.path.basename(path) == filename
+    ]
+    for path in candidates:
+        try:
+            if os.path.getsize(path) == entry["size"]:
+                return path
+        except OSError:
+            continue
+    return None
+
+
+def materialize_image(source: str, dest_dir: str) -> str:
+    """Hardlink (or, across filesystems, copy) a stored image into a
+    directory under its content-addressed name, returning that name"""
+    filename = os.path.basename(source)
+    dest = os.path.join(dest_dir, filename)
+    if os.path.exists(dest):
+        return filename
+
+    os.makedirs(dest_dir, exist_ok=True)
+    try:
+        os.link(source, dest)
+    except FileExistsError:
+        # Another thread got there first
+        pass
+    except OSError:
+        shutil.copyfile(source, dest)
+    return filename
+
+
+def remember_image_copy(key: str, entry: ImageIndexEntry, path: str) -> None:
+    """Record in image_index that a copy of the image for key is at path,
+    dropping copies that no longer exist"""
+    path = os.path.normpath(path)
+    paths = [p for p in entry.get("paths", []) if p != path and os.path.exists(p)]
+    updated = {**entry, "paths": sorted(paths + [path])}
+    if updated != image_index.get(key):
+        image_index.set(key, updated)
+
+
+def store_image_bytes(data: bytes, entry: ImageIndexEntry) -> str:
+    """Add an image to the content-addressed store, returning its path"""
+    path = image_store_path(entry)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _smallest_encoding(
+    img: Image.Image, source_format: Optional[str]
+) -> Tuple[bytes, str]:
+    """Encode an image losslessly in its own format (PNG or JPEG at high
+    quality) and as WebP, returning whichever is smaller"""
+    candidates = []
+    if source_format == "PNG":
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG", optimize=True)
+        candidates.append((buffer.getvalue(), ".png"))
+    elif source_format == "JPEG":
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, format="JPEG", quality=90, optimize=True)
+        candidates.append((buffer.getvalue(), ".jpg"))
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="WEBP", quality=IMAGE_WEBP_QUALITY)
+    candidates.append((buffer.getvalue(), ".webp"))
+
+    return min(candidates, key=lambda candidate: len(candidate[0]))
+
+
+def encode_optimized_image(
+    path: str,
+    max_dimension: int = IMAGE_MAX_DIMENSION,
+    variant_widths: Tuple[int, ...] = IMAGE_VARIANT_WIDTHS,
+) -> List[Tuple[bytes, str, int, int]]:
+    """
+    Recompress an image, capped at max_dimension, and make narrower copies
+    at variant_widths
+
+    Runs in a spawned worker process, so the caller passes the limits in
+    rather than the worker reading them from this module. The full-size
+    copy keeps the original bytes when neither resizing nor recompression
+    makes it smaller. Animated images are left alone.
+
+    Returns:
+        (data, ext, width, height) for the full-size copy, then each
+        narrower copy, widest first
+    """
+    with open(path, "rb") as f:
+        original = f.read()
+    original_ext = os.path.splitext(path)[1]
+
+    with Image.open(io.BytesIO(original)) as img:
+        if getattr(img, "is_animated", False):
+            return [(original, original_ext, img.width, img.height)]
+
+        source_format = img.format
+        full = img if img.mode in ("RGB", "RGBA", "L", "LA") else img.convert("RGBA")
+        resized = max(full.size) > max_dimension
+        if resized:
+            full = full.copy()
+            full.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        data, ext = _smallest_encoding(full, source_format)
+        if not resized and len(original) <= len(data):
+            data, ext = original, original_ext
+        copies = [(data, ext, full.width, full.height)]
+
+        for width in sorted(variant_widths, reverse=True):
+            if width >= full.width:
+                continue
+            height = max(1, round(full.height * width / full.width))
+            variant = full.resize((width, height), Image.LANCZOS)
+            copies.append((*_smallest_encoding(variant, source_format), width, height))
+
+    return copies
+
+
+def optimize_post_images(
+    filenames: List[str], post_dir: str
+) -> Dict[str, List[ImageVariantEntry]]:
+    """
+    Optimize images saved in a post directory (see IMAGE_MAX_DIMENSION)
+
+    Images already in image_variant_index are linked into post_dir from
+    existing copies without being decoded; the rest are encoded on a pool
+    of IMAGE_OPTIMIZE_WORKERS processes. Originals replaced by a smaller
+    copy are removed from post_dir. Images that fail to optimize are left
+    as they are and aren't in the result.
+
+    Returns:
+        Dict mapping each original filename to its copies, full size first
+    """
+    results = {}
+    pending = []
+    for filename in dict.fromkeys(filenames):
+        variants = image_variant_index.get(os.path.splitext(filename)[0])
+        if variants and all(find_stored_image(variant) for variant in variants):
+            results[filename] = variants
+        else:
+            pending.append(filename)
+
+    if pending:
+        workers = min(IMAGE_OPTIMIZE_WORKERS, len(pending))
+        # Spawned, not forked: by now this process has the background event
+        # loop and download threads running, and forking those can deadlock
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = {
+                filename: executor.submit(
+                    encode_optimized_image,
+                    os.path.join(post_dir, filename),
+                    IMAGE_MAX_DIMENSION,
+                    IMAGE_VARIANT_WIDTHS,
+                )
+                for filename in pending
+            }
+            for filename, future in futures.items():
+                try:
+                    copies = future.result()
+                except Exception as e:
+                    print(f"Error optimizing image {filename}: {e}")
+                    continue
+
+                variants = []
+                for data, ext, width, height in copies:
+                    variant = {
+                        "sha256": hashlib.sha256(data).hexdigest(),
+                        "ext": ext,
+                        "size": len(data),
+                        "paths": [],
+                        "width": width,
+                        "height": height,
+                    }
+                    store_image_bytes(data, variant)
+                    record_image_manifest(
+                        variant["sha256"],
+                        width,
+                        height,
+                        len(data),
+                        IMAGE_MIME_TYPES.get(ext),
+                    )
+                    variants.append(variant)
+                results[filename] = variants
+
+    for filename, variants in results.items():
+        updated = []
+        for variant in variants:
+            source = find_stored_image(variant)
+            path = os.path.normpath(
+                os.path.join(post_dir, materialize_image(source, post_dir))
+            )
+            paths = [p for p in variant["paths"] if p != path and os.path.exists(p)]
+            updated.append({**variant, "paths": sorted(paths + [path])})
+        image_variant_index.set(os.path.splitext(filename)[0], updated)
+        results[filename] = updated
+
+        optimized = f"{updated[0]['sha256']}{updated[0]['ext']}"
+        if optimized != filename and os.path.exists(os.path.join(post_dir, filename)):
+            os.remove(os.path.join(post_dir, filename))
+            print(f"Optimized image: {filename} -> {optimized}")
+
+    return results
+
+
+def describe_image(
+    path: str, data: Optional[bytes] = None
+) -> Optional[ImageManifestEntry]:
+    """
+    The image_manifest entry for a content-addressed image
+
+    Images not yet in the manifest have their header read (from data, if
+    given, otherwise from path) and are added to it.
+
+    Returns:
+        The entry, or None if the image can't be read
+    """
+    sha256, ext = os.path.splitext(os.path.basename(path))
+    entry = image_manifest.get(sha256)
+    if entry:
+        return entry
+
+    try:
+        with Image.open(io.BytesIO(data) if data is not None else path) as img:
+            width, height = img.size
+            mime = Image.MIME.get(img.format) or IMAGE_MIME_TYPES.get(ext.lower())
+        size = len(data) if data is not None else os.path.getsize(path)
+    except Exception as e:
+        print(f"Error reading image {path}: {e}")
+        return None
+
+    return record_image_manifest(sha256, width, height, size, mime)
 
-    # Replace image URLs with local filenames
-    for url, local_filename in url_to_filename.items():
-        result = result.replace(url, local_filename)
 
-    # Convert plain URLs to titled links for blog posts
-    # Match URLs that aren't already in markdown link format
-    url_pattern = r'(?<!\]\()https?://[^\s)]+(?!\))'
+def image_placeholder(path: str) -> Optional[str]:
+    """
+    A tiny data: URI placeholder for a content-addressed image
 
-    def replace_with_titled_link(match):
-        url = match.group(0)
-        # Clean up any trailing punctuation
-        url = re.sub(r'[.,;:!?]+$', '', url)
+    Made once per content hash and kept in image_placeholders.
 
-        # Fetch metadata for the URL
-        metadata = get_url_metadata(url)
-        title = metadata.get('title')
+    Returns:
+        The data URI, or None if the image can't be read
+    """
+    sha256 = os.path.splitext(os.path.basename(path))[0]
+    placeholder = image_placeholders.get(sha256)
+    if placeholder:
+        return placeholder
 
-        if title:
-            return f"\n\n[{title}]({url})"
-        else:
-            # If we can't get a title, keep the plain URL
-            return url
+    try:
+        with Image.open(path) as img:
+            size = (PLACEHOLDER_MAX_DIMENSION, PLACEHOLDER_MAX_DIMENSION)
+            img.draft("RGB", size)
+            img.thumbnail(size, Image.LANCZOS)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            buffer = io.BytesIO()
+            img.save(buffer, format="WEBP", quality=PLACEHOLDER_QUALITY)
+    except Exception as e:
+        print(f"Error making placeholder for image {path}: {e}")
+        return None
 
-    result = re.sub(url_pattern, replace_with_titled_link, result)
-    return result
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    placeholder = f"data:image/webp;base64,{encoded}"
+    image_placeholders.set(sha256, placeholder)
+    return placeholder
+
+
+def record_image_manifest(
+    sha256: str, width: int, height: int, size: int, mime: Optional[str]
+) -> ImageManifestEntry:
+    """Add an image whose details are already known to image_manifest"""
+    entry = {
+        "sha256": sha256,
+        "width": width,
+        "height": height,
+        "bytes": size,
+        "mime": mime or "application/octet-stream",
+    }
+    if image_manifest.get(sha256) != entry:
+        image_manifest.set(sha256, entry)
+    return entry
 
 
-def extract_images_from_issue(issue_body: str) -> List[str]:
-    """Extract image URLs from GitHub issue markdown content (legacy function)"""
-    _, images = process_issue_text(issue_body)
-    return [img["src"] for img in images]
+def flatten_to_rgb(img: Image.Image) -> Image.Image:
+    """An RGB copy of an image for JPEG, with transparency over white"""
+    if img.mode == "RGB":
+        return img
+    background = Image.new("RGB", img.size, (255, 255, 255))
+    rgba = img.convert("RGBA")
+    background.paste(rgba, mask=rgba.getchannel("A"))
+    return background
 
 
-def remove_images_from_text(text: str) -> str:
-    """Remove image HTML and markdown from text content (legacy function)"""
-    cleaned_text, _ = process_issue_text(text)
-    return cleaned_text
+def fit_image(data: bytes, max_bytes: int, max_dimension: int) -> Tuple[bytes, str]:
+    """
+    Shrink an image until it fits within max_bytes and max_dimension
 
+    Images that already fit are returned untouched. Others are decoded at
+    reduced size where the format allows (JPEG draft mode, then reduce),
+    scaled to max_dimension, and saved as PNG if the source was a PNG that
+    now fits. Otherwise the highest JPEG quality that fits is found by
+    binary search, scaling down further if even the lowest doesn't.
 
-def download_image(image_url: str, dest_path: str) -> Optional[str]:
-    """Download an image and save it to the specified path"""
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Authorization": (
-                f"token {os.environ.get('GITHUB_TOKEN', '')}"
-                if "github" in image_url
-                else None
-            ),
-        }
-        headers = {k: v for k, v in headers.items() if v is not None}
+    Returns:
+        (image bytes, file extension)
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        ext = sniff_image_extension(data[:32])
+        if len(data) <= max_bytes and max(img.size) <= max_dimension:
+            return data, ext
+
+        source_format = img.format
+        scale = min(1.0, max_dimension / max(img.size))
+        target = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        img.draft("RGB", target)
+        decoded = img if img.mode in ("RGB", "RGBA", "L", "LA") else img.convert("RGBA")
+        factor = min(decoded.width // target[0], decoded.height // target[1])
+        resized = decoded.reduce(factor) if factor > 1 else decoded.copy()
+        if resized.size != target:
+            resized = resized.resize(target, Image.LANCZOS)
+
+    if source_format == "PNG":
+        buffer = io.BytesIO()
+        resized.save(buffer, format="PNG", optimize=True)
+        if buffer.tell() <= max_bytes:
+            return buffer.getvalue(), ".png"
+
+    resized = flatten_to_rgb(resized)
+
+    while True:
+        best = None
+        low, high = FIT_IMAGE_MIN_QUALITY, FIT_IMAGE_MAX_QUALITY
+        while low <= high:
+            quality = (low + high) // 2
+            buffer = io.BytesIO()
+            resized.save(buffer, format="JPEG", quality=quality, optimize=True)
+            if buffer.tell() <= max_bytes:
+                best = buffer.getvalue()
+                low = quality + 1
+            else:
+                high = quality - 1
+        if best is not None:
+            return best, ".jpg"
 
-        response = requests.get(image_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        resized = resized.resize(
+            (max(1, resized.width * 3 // 4), max(1, resized.height * 3 // 4)),
+            Image.LANCZOS,
+        )
 
-        file_ext = ""
-        if "." in image_url.split("/")[-1]:
-            file_ext = "." + image_url.split("/")[-1].split(".")[-1].split("?")[0]
-        elif response.headers.get("content-type"):
-            content_type = response.headers["content-type"]
-            if "jpeg" in content_type or "jpg" in content_type:
-                file_ext = ".jpg"
-            elif "png" in content_type:
-                file_ext = ".png"
-            elif "gif" in content_type:
-                file_ext = ".gif"
-            elif "webp" in content_type:
-                file_ext = ".webp"
-
-        if not file_ext:
-            file_ext = ".jpg"
-
-        # Content-addressed so re-downloading the same image (e.g. the
-        # workflow reprocessing an issue) reuses the existing file instead
-        # of leaving an orphaned duplicate behind.
-        filename = f"{hashlib.sha256(response.content).hexdigest()}{file_ext}"
-        full_path = os.path.join(dest_path, filename)
-
-        with open(full_path, "wb") as f:
-            f.write(response.content)
 
-        return filename
-    except Exception as e:
-        print(f"Error downloading image {image_url}: {e}")
-        return None
+def prepare_image_for_platform(
+    artifact: ImageArtifact, platform: str
+) -> Tuple[str, bytes]:
+    """
+    An image's bytes fitted to a platform's PLATFORM_IMAGE_LIMITS
+
+    Prepared copies are kept in the image store and recorded in
+    platform_image_index by (platform, content hash), so each is only
+    made once.
+
+    Returns:
+        (filename, image bytes) to upload
+    """
+    key = f"{platform}/{os.path.splitext(artifact.filename)[0]}"
+    entry = platform_image_index.get(key)
+    source = find_stored_image(entry) if entry else None
+    if source is not None:
+        if source == artifact.path:
+            return artifact.filename, artifact.read()
+        with open(source, "rb") as f:
+            return os.path.basename(source), f.read()
+
+    data = artifact.read()
+    fitted, ext = fit_image(data, **PLATFORM_IMAGE_LIMITS[platform])
+    if fitted is data:
+        sha256, ext = os.path.splitext(artifact.filename)
+        entry = {"sha256": sha256, "ext": ext, "size": len(data), "paths": []}
+    else:
+        entry = {
+            "sha256": hashlib.sha256(fitted).hexdigest(),
+            "ext": ext,
+            "size": len(fitted),
+            "paths": [],
+        }
+        store_image_bytes(fitted, entry)
+        describe_image(image_store_path(entry), fitted)
+        print(
+            f"Fitted image {artifact.filename} for {platform}: "
+            f"{len(data)} -> {len(fitted)} bytes"
+        )
+    platform_image_index.set(key, entry)
+    return f"{entry['sha256']}{entry['ext']}", fitted
 
 
 def should_skip_issue(issue) -> bool:
@@ -456,10 +2504,20 @@ def process_github_issues(issues, for_social: bool = False):
     return results
 
 
+def get_github_repo():
+    """This process's handle on the site's repository. Its payload includes
+    the owner, so repo.owner.login costs no further requests."""
+    return get_client(
+        "github",
+        lambda: Github(os.environ["GITHUB_TOKEN"]).get_repo(
+            os.environ["GITHUB_REPOSITORY"]
+        ),
+    )
+
+
 def get_issues_from_github(issue_id: Optional[int] = None):
     """Fetch issues from GitHub"""
-    g = Github(os.environ["GITHUB_TOKEN"])
-    repo = g.get_repo(os.environ["GITHUB_REPOSITORY"])
+    repo = get_github_repo()
     repo_owner = repo.owner.login
 
     if issue_id:
@@ -617,8 +2675,64 @@ def get_post_directory_path(post: Post, content_dir: str = "./content") -> str:
     return os.path.join(content_dir, "link", slug)
 
 
-def generate_markdown_content(post: Post, downloaded_images: List[str] = None) -> str:
-    """Generate the markdown content for a post (legacy with images in frontmatter)"""
+def image_dimensions(
+    image_info: ImageInfo,
+    filename: Optional[str] = None,
+    variants: Optional[List[ImageVariantEntry]] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    An image's (width, height) without decoding it, if known
+
+    Optimized copies know their own size; otherwise the issue's <img> tag
+    is used, then image_manifest.
+    """
+    if variants:
+        return variants[0]["width"], variants[0]["height"]
+    if image_info.get("width") and image_info.get("height"):
+        return image_info["width"], image_info["height"]
+    manifest = image_manifest.get(os.path.splitext(filename)[0]) if filename else None
+    if manifest:
+        return manifest["width"], manifest["height"]
+    return None
+
+
+def frontmatter_resource(
+    filename: str,
+    alt: Optional[str],
+    variants: Optional[List[ImageVariantEntry]] = None,
+    dimensions: Optional[Tuple[int, int]] = None,
+    placeholder: Optional[str] = None,
+) -> List[str]:
+    """Frontmatter lines for an image's `resources` entry: its alt text,
+    dimensions (see image_dimensions), placeholder (see image_placeholder),
+    and for optimized images, its narrower variants for srcset"""
+    lines = [f"  - src: {filename}", f"    params:"]
+    if alt:
+        lines.append(f'      alt: "{alt}"')
+    if dimensions:
+        lines.append(f"      width: {dimensions[0]}")
+        lines.append(f"      height: {dimensions[1]}")
+    if placeholder:
+        lines.append(f'      placeholder: "{placeholder}"')
+    if variants and len(variants) > 1:
+        lines.append("      variants:")
+        for variant in variants[1:]:
+            lines.append(f"        - src: {variant['sha256']}{variant['ext']}")
+            lines.append(f"          width: {variant['width']}")
+    return lines
+
+
+def generate_markdown_content(
+    post: Post,
+    downloaded_images: List[str] = None,
+    image_variants: Optional[Dict[str, List[ImageVariantEntry]]] = None,
+) -> str:
+    """Generate the markdown content for a post (legacy with images in frontmatter)
+
+    image_variants maps optimized filenames to their copies (see
+    optimize_post_images).
+    """
+    image_variants = image_variants or {}
     content = ["---"]
     content.append(f"date: {post['date']}")
 
@@ -641,14 +2755,25 @@ def generate_markdown_content(post: Post, downloaded_images: List[str] = None) -
             downloaded_filename = src_to_filename.get(
                 image_info["src"], image_info["src"]
             )
-            if image_info.get("alt"):
-                resources.append((downloaded_filename, image_info["alt"]))
+            variants = image_variants.get(downloaded_filename)
+            dimensions = image_dimensions(image_info, downloaded_filename, variants)
+            placeholder = image_placeholders.get(
+                os.path.splitext(downloaded_filename)[0]
+            )
+            if image_info.get("alt") or variants or dimensions or placeholder:
+                resources.append(
+                    (
+                        downloaded_filename,
+                        image_info.get("alt"),
+                        variants,
+                        dimensions,
+                        placeholder,
+                    )
+                )
         if resources:
             content.append("resources:")
-            for filename, alt in resources:
-                content.append(f"  - src: {filename}")
-                content.append(f"    params:")
-                content.append(f'      alt: "{alt}"')
+            for resource in resources:
+                content.extend(frontmatter_resource(*resource))
     elif downloaded_images:
         content.append("images:")
         for image in downloaded_images:
@@ -662,9 +2787,17 @@ def generate_markdown_content(post: Post, downloaded_images: List[str] = None) -
 
 
 def generate_markdown_content_inline(
-    post: Post, markdown_text: str, url_to_filename: Dict[str, str]
+    post: Post,
+    markdown_text: str,
+    url_to_filename: Dict[str, str],
+    image_variants: Optional[Dict[str, List[ImageVariantEntry]]] = None,
 ) -> str:
-    """Generate markdown with inline images and frontmatter images for Hugo template"""
+    """Generate markdown with inline images and frontmatter images for Hugo template
+
+    image_variants maps optimized filenames to their copies (see
+    optimize_post_images).
+    """
+    image_variants = image_variants or {}
     content = ["---"]
     content.append(f"date: {post['date']}")
 
@@ -678,14 +2811,25 @@ def generate_markdown_content_inline(
         resources = []
         for image_info in post["images"]:
             local_filename = url_to_filename.get(image_info["src"])
-            if local_filename and image_info.get("alt"):
-                resources.append((local_filename, image_info["alt"]))
+            if not local_filename:
+                continue
+            variants = image_variants.get(local_filename)
+            dimensions = image_dimensions(image_info, local_filename, variants)
+            placeholder = image_placeholders.get(os.path.splitext(local_filename)[0])
+            if image_info.get("alt") or variants or dimensions or placeholder:
+                resources.append(
+                    (
+                        local_filename,
+                        image_info.get("alt"),
+                        variants,
+                        dimensions,
+                        placeholder,
+                    )
+                )
         if resources:
             content.append("resources:")
-            for filename, alt in resources:
-                content.append(f"  - src: {filename}")
-                content.append(f"    params:")
-                content.append(f'      alt: "{alt}"')
+            for resource in resources:
+                content.extend(frontmatter_resource(*resource))
 
     content.append("---")
     content.append("")
@@ -697,13 +2841,10 @@ def generate_markdown_content_inline(
 def download_post_images(post: Post, dest_path: str) -> List[str]:
     """Download all images for a post and return the list of downloaded filenames"""
     downloaded_images = []
-    if post.get("images"):
-        for image_info in post["images"]:
-            image_url = image_info["src"]
-            downloaded_filename = download_image(image_url, dest_path)
-            if downloaded_filename:
-                downloaded_images.append(downloaded_filename)
-                print(f"Downloaded image: {downloaded_filename}")
+    for artifact in get_post_image_artifacts(post, dest_path):
+        if artifact:
+            downloaded_images.append(artifact.filename)
+            print(f"Downloaded image: {artifact.filename}")
     return downloaded_images
 
 
@@ -712,10 +2853,14 @@ def save_post(
     test_mode: bool = False,
     force: bool = False,
     specific_issue: bool = False,
+    optimize_images: bool = False,
 ) -> str:
     """
     Save post to Hugo blog
 
+    With optimize_images, images are recompressed and given responsive
+    variants (see optimize_post_images).
+
     Returns:
         Path to the post directory
     """
@@ -741,13 +2886,37 @@ def save_post(
                     )
 
             url_to_filename = {}
-            if post.get("images"):
-                for image_info in post["images"]:
-                    image_url = image_info["src"]
-                    downloaded_filename = download_image(image_url, post_dir)
-                    if downloaded_filename:
-                        url_to_filename[image_url] = downloaded_filename
-                        print(f"Downloaded image: {downloaded_filename}")
+            artifacts = get_post_image_artifacts(post, post_dir)
+            for image_info, artifact in zip(post.get("images") or [], artifacts):
+                if artifact:
+                    url_to_filename[image_info["src"]] = artifact.filename
+                    print(f"Downloaded image: {artifact.filename}")
+
+            image_variants = {}
+            if optimize_images and url_to_filename:
+                optimized = optimize_post_images(
+                    list(url_to_filename.values()), post_dir
+                )
+                for url, filename in url_to_filename.items():
+                    if filename in optimized:
+                        variants = optimized[filename]
+                        url_to_filename[url] = (
+                            f"{variants[0]['sha256']}{variants[0]['ext']}"
+                        )
+                        image_variants[url_to_filename[url]] = variants
+
+            # An <img> tag's size is how big GitHub displays the image (often
+            # half a retina screenshot's pixels), so it only goes in this
+            # post's frontmatter. image_manifest gets the file's own size,
+            # read from its header; optimized copies are already in it.
+            for image_info in post.get("images") or []:
+                filename = url_to_filename.get(image_info["src"])
+                if not filename:
+                    continue
+                path = os.path.join(post_dir, filename)
+                if filename not in image_variants:
+                    describe_image(path)
+                image_placeholder(path)
 
             if post.get("original_body"):
                 # First clean the text (remove img tags, etc) but keep links
@@ -755,14 +2924,17 @@ def save_post(
                 # Convert plain URLs to titled links for blog posts
                 markdown_text = process_issue_text_for_blog(markdown_text, {})
                 markdown_content = generate_markdown_content_inline(
-                    post, markdown_text, url_to_filename
+                    post, markdown_text, url_to_filename, image_variants
                 )
             else:
                 downloaded_images = list(url_to_filename.values())
-                markdown_content = generate_markdown_content(post, downloaded_images)
+                markdown_content = generate_markdown_content(
+                    post, downloaded_images, image_variants
+                )
 
             with open(os.path.join(post_dir, "index.md"), "w", encoding="utf-8") as f:
                 f.write(markdown_content)
+            reset_local_content_index()
 
             print(f"✓ Saved blog post to {post_dir}")
         else:
@@ -773,15 +2945,269 @@ def save_post(
     return post_dir
 
 
+_clients: Dict[str, object] = {}
+_client_locks: Dict[str, threading.Lock] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name: str, create: Callable[[], object]):
+    """Return this process's client called name, made by create() on first
+    use. A create() that raises is tried again next time."""
+    with _clients_lock:
+        lock = _client_locks.setdefault(name, threading.Lock())
+    with lock:
+        if name not in _clients:
+            _clients[name] = create()
+        return _clients[name]
+
+
+def reset_clients() -> None:
+    """Forget every platform client, e.g. after credentials change"""
+    with _clients_lock:
+        _clients.clear()
+
+
+def save_bluesky_session(event, session) -> None:
+    """Keep a new or refreshed Bluesky session for the next run"""
+    path = os.path.join(CACHE_DIR, BLUESKY_SESSION_FILE)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(session.export())
+    os.replace(tmp_path, path)
+
+
+def login_bluesky() -> Client:
+    """
+    A logged-in Bluesky client
+
+    Resumes the saved session if there is one (atproto refreshes its tokens
+    as needed), and only logs in with the app password if that fails.
+    """
+    client = Client(
+        request=Request(
+            event_hooks={
+                "response": [
+                    lambda response: observe_post_response(
+                        "bluesky",
+                        response.request.method,
+                        str(response.request.url),
+                        response.headers,
+                    )
+                ]
+            }
+        )
+    )
+    client.on_session_change(save_bluesky_session)
+
+    try:
+        path = os.path.join(CACHE_DIR, BLUESKY_SESSION_FILE)
+        with open(path, "r", encoding="utf-8") as f:
+            session_string = f.read().strip()
+    except FileNotFoundError:
+        session_string = None
+    if session_string:
+        try:
+            client.login(session_string=session_string)
+            return client
+        except Exception as e:
+            print(f"Could not resume Bluesky session, logging in again: {e}")
+
+    client.login(BLUESKY_HANDLE, os.environ["BLUESKY_APP_PASSWORD"])
+    return client
+
+
+def get_bluesky_client() -> Client:
+    return get_client("bluesky", login_bluesky)
+
+
+def make_x_clients() -> Tuple[tweepy.Client, tweepy.API]:
+    """X's v2 client for posts and v1.1 API for media uploads"""
+    client = tweepy.Client(
+        consumer_key=os.environ["X_CONSUMER_KEY"],
+        consumer_secret=os.environ["X_CONSUMER_SECRET"],
+        access_token=os.environ["X_ACCESS_TOKEN"],
+        access_token_secret=os.environ["X_ACCESS_TOKEN_SECRET"],
+    )
+    auth = tweepy.OAuthHandler(
+        os.environ["X_CONSUMER_KEY"], os.environ["X_CONSUMER_SECRET"]
+    )
+    auth.set_access_token(
+        os.environ["X_ACCESS_TOKEN"], os.environ["X_ACCESS_TOKEN_SECRET"]
+    )
+    api = tweepy.API(auth)
+
+    # tweepy would sleep through an exhausted window, for up to 15 minutes;
+    # the limiter reads its responses and defers instead
+    client.session.hooks["response"].append(
+        lambda response, *args, **kwargs: observe_post_response(
+            "x", response.request.method, response.url, response.headers
+        )
+    )
+    return client, api
+
+
+def get_x_clients() -> Tuple[tweepy.Client, tweepy.API]:
+    return get_client("x", make_x_clients)
+
+
+def get_x_user_id(client: tweepy.Client) -> str:
+    """The posting account's X user ID, looked up once per access token"""
+    token_hash = hashlib.sha256(os.environ["X_ACCESS_TOKEN"].encode("utf-8"))
+    key = f"x_user_id/{token_hash.hexdigest()[:16]}"
+    user_id = identity_cache.get(key)
+    if user_id is None:
+        user_id = str(client.get_me().data.id)
+        identity_cache.set(key, user_id)
+    return user_id
+
+
+class RateLimitDeferred(Exception):
+    """Raised instead of waiting out an exhausted rate limit window"""
+
+    def __init__(self, platform: str, retry_at: float):
+        self.platform = platform
+        self.retry_at = retry_at
+        until = datetime.fromtimestamp(retry_at, timezone.utc).strftime("%H:%M:%S")
+        super().__init__(f"{platform} rate limited until {until} UTC")
+
+
+def parse_rate_limit_reset(value: str) -> Optional[float]:
+    """A rate limit reset header as a Unix time: X and Bluesky send epoch
+    seconds, Mastodon an ISO 8601 UTC timestamp"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        reset = datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+    return reset.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RateLimiter:
+    """
+    Paces posts to one platform
+
+    A token bucket refilled at the platform's published rate, with posts
+    kept POST_MIN_INTERVAL apart. observe() corrects the bucket from
+    rate limit headers, so an exhausted window is waited out (or deferred,
+    see acquire) rather than hit.
+    """
+
+    # Mastodon, X and Bluesky spell these differently
+    REMAINING_HEADERS = (
+        "x-ratelimit-remaining",
+        "x-rate-limit-remaining",
+        "ratelimit-remaining",
+    )
+    RESET_HEADERS = ("x-ratelimit-reset", "x-rate-limit-reset", "ratelimit-reset")
+
+    def __init__(self, platform: str, capacity: int, window: float):
+        self.platform = platform
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._last_acquired: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def observe(self, headers) -> None:
+        """Update the bucket from a response's rate limit headers"""
+        headers = {key.lower(): value for key, value in headers.items()}
+        remaining = next(
+            (headers[name] for name in self.REMAINING_HEADERS if name in headers),
+            None,
+        )
+        reset = next(
+            (headers[name] for name in self.RESET_HEADERS if name in headers), None
+        )
+        try:
+            remaining = int(remaining)
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, remaining)
+            reset_at = parse_rate_limit_reset(reset) if reset else None
+            if remaining == 0 and reset_at:
+                self.blocked_until = max(self.blocked_until, reset_at)
+
+    def acquire(self, max_wait: float = RATE_LIMIT_MAX_WAIT) -> None:
+        """
+        Wait until a post is allowed, then take a token
+
+        Raises:
+            RateLimitDeferred: If that would mean waiting over max_wait
+        """
+        with self._lock:
+            self._refill()
+            waits = [0.0, self.blocked_until - time.time()]
+            if self._last_acquired is not None:
+                since_last = time.monotonic() - self._last_acquired
+                waits.append(POST_MIN_INTERVAL - since_last)
+            if self.tokens < 1:
+                waits.append((1 - self.tokens) / self.rate)
+            wait = max(waits)
+            if wait > max_wait:
+                raise RateLimitDeferred(self.platform, time.time() + wait)
+
+            if wait > 0:
+                print(f"  Waiting {wait:.1f} seconds before next post...")
+                time.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            self._last_acquired = time.monotonic()
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(platform: str) -> RateLimiter:
+    """Return this process's RateLimiter for a platform"""
+    with _rate_limiters_lock:
+        if platform not in _rate_limiters:
+            _rate_limiters[platform] = RateLimiter(
+                platform, *POST_RATE_LIMITS[platform]
+            )
+        return _rate_limiters[platform]
+
+
+def observe_post_response(platform: str, method: str, url: str, headers) -> None:
+    """Pass a response's rate limit headers to the platform's RateLimiter,
+    if it came from the endpoint that creates posts (see POST_ENDPOINTS)"""
+    path = urlsplit(url).path.rstrip("/")
+    if (method.upper(), path) == POST_ENDPOINTS[platform]:
+        get_rate_limiter(platform).observe(headers)
+
+
+def reset_rate_limiters() -> None:
+    """Forget every platform's rate limit state"""
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
+
+
 def post_to_social_media(
     posts: List[Post],
     platforms: List[str],
     test_mode: bool = False,
     force: bool = False,
     specific_issue: bool = False,
-) -> None:
+) -> List[PublishOutcome]:
     """
-    Post a list of posts (thread) to social media platforms
+    Post a list of posts (thread) to social media platforms, all at once
 
     Args:
         posts: List of Post dicts with thread metadata
@@ -789,12 +3215,12 @@ def post_to_social_media(
         test_mode: If True, only print what would be posted
         force: If True, post even if similar posts exist
         specific_issue: If True, specific issue was requested
+
+    Returns:
+        An outcome for each platform posted to
     """
     if not posts:
-        return
-
-    first_post = posts[0]
-    post_dir = get_post_directory_path(first_post)
+        return []
 
     print(f"\nPosting thread ({len(posts)} post(s)) to social media...")
 
@@ -810,133 +3236,316 @@ def post_to_social_media(
                 print(f"Images: {len(post['images'])} image(s)")
             print()
 
-        return
+        return []
 
-    first_platform = True
-    if "mastodon" in platforms:
-        if not first_platform:
-            print("Waiting 10 seconds before posting to next platform...")
-            time.sleep(10)
-        post_to_mastodon(posts, post_dir)
-        first_platform = False
-    if "x" in platforms:
-        if not first_platform:
-            print("Waiting 10 seconds before posting to next platform...")
-            time.sleep(10)
-        post_to_x(posts, post_dir)
-        first_platform = False
-    if "bluesky" in platforms:
-        if not first_platform:
-            print("Waiting 10 seconds before posting to next platform...")
-            time.sleep(10)
-        post_to_bluesky(posts, post_dir)
-        first_platform = False
-
-
-def search_similar_posts_mastodon(post: Post, token: str) -> bool:
-    search_term = post["text"][:30]
-    headers = {
-        "Authorization": f"Bearer {token}",
+    # Platforms don't depend on each other, so each gets its own worker and
+    # paces its own thread; the slowest one sets how long this takes
+    publishers = {
+        "mastodon": post_to_mastodon,
+        "x": post_to_x,
+        "bluesky": post_to_bluesky,
     }
+    selected = [platform for platform in publishers if platform in platforms]
+    if not selected:
+        return []
 
-    try:
-        statuses_url = (
-            f"https://mastodon.social/api/v1/accounts/{MASTODON_USER_ID}/statuses"
-        )
-        params = {
-            "limit": 20,
-            "exclude_replies": True,
-            "exclude_reblogs": True,
-        }
+    def publish(platform: str) -> PublishOutcome:
+        start = time.monotonic()
+        try:
+            outcome = publishers[platform](posts)
+        except Exception as e:
+            outcome = publish_outcome(platform, "failed", detail=str(e))
+        outcome["seconds"] = time.monotonic() - start
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=len(selected)) as executor:
+        outcomes = list(executor.map(publish, selected))
+
+    print_publish_report(outcomes)
+    return outcomes
+
+
+def publish_outcome(
+    platform: str, status: str, posts: int = 0, detail: Optional[str] = None
+) -> PublishOutcome:
+    return {
+        "platform": platform,
+        "status": status,
+        "posts": posts,
+        "detail": detail,
+        "seconds": 0.0,
+    }
 
-        response = requests.get(
-            statuses_url, headers=headers, params=params, timeout=10
+
+def print_publish_report(outcomes: List[PublishOutcome]) -> None:
+    """Print how posting went on each platform"""
+    print("\nPublishing report:")
+    for outcome in outcomes:
+        detail = f" ({outcome['detail']})" if outcome["detail"] else ""
+        print(
+            f"  {outcome['platform']}: {outcome['status']}, {outcome['posts']}"
+            f" post(s) in {outcome['seconds']:.1f}s{detail}"
         )
-        response.raise_for_status()
-        statuses = response.json()
 
-        for status in statuses:
-            import re
 
-            plain_text = re.sub("<[^<]+?>", "", status.get("content", "")).lower()
+FINGERPRINT_URL_PATTERN = re.compile(r"https?://[^\s<>\"']+")
+
+
+def text_fingerprint(text: str) -> Tuple[Optional[int], List[str]]:
+    """
+    Fingerprint a post's text for duplicate detection
 
-            if search_term.lower() in plain_text:
-                return True
+    Returns:
+        (SimHash of the text's word shingles, or None if it has no words;
+        the sorted normalized URLs in it). Links are left out of the
+        SimHash, since platforms rewrite and shorten them.
+    """
+    urls = sorted(
+        {
+            normalize_url(strip_tracking_params(url.rstrip(".,;:!?)")))
+            for url in FINGERPRINT_URL_PATTERN.findall(text)
+        }
+    )
+    words = re.findall(r"\w+", FINGERPRINT_URL_PATTERN.sub(" ", text).lower())
+    if not words:
+        return None, urls
 
-        return False
+    size = min(FINGERPRINT_SHINGLE_WORDS, len(words))
+    weights = [0] * 64
+    for i in range(len(words) - size + 1):
+        shingle = " ".join(words[i : i + size]).encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error searching Mastodon for similar posts: {str(e)}")
-        return True
+    simhash = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return simhash, urls
 
 
-def search_similar_posts_x_v2(post: Post, client: tweepy.Client, user_id: str) -> bool:
-    """Check if a similar post already exists on X/Twitter using v2 API"""
-    search_term = post["text"][:30]
+def record_fingerprint(
+    platform: str, post_id: str, text: str, posted_at: Optional[float] = None
+) -> None:
+    """Add a published post to the fingerprint index"""
+    simhash, urls = text_fingerprint(text)
+    fingerprint_index.set(
+        f"{platform}/{post_id}",
+        {
+            "platform": platform,
+            "post_id": post_id,
+            "simhash": simhash,
+            "urls": urls,
+            "posted_at": posted_at or time.time(),
+        },
+    )
 
-    try:
-        tweets = client.get_users_tweets(
-            id=user_id, max_results=20, exclude=["retweets", "replies"]
-        )
 
-        if tweets.data:
-            for tweet in tweets.data:
-                if search_term.lower() in tweet.text.lower():
-                    return True
+def find_similar_post(
+    text: str, platform: str, max_distance: int = FINGERPRINT_MAX_DISTANCE
+) -> Optional[FingerprintEntry]:
+    """
+    Find a published post on a platform that text duplicates: one whose
+    SimHash is within max_distance bits (and, if both link somewhere, that
+    shares a URL with it), or, for texts with no words of their own, one
+    linking to exactly the same URLs
+    """
+    simhash, urls = text_fingerprint(text)
+    for entry in fingerprint_index.values():
+        if entry["platform"] != platform:
+            continue
+        if simhash is not None and entry["simhash"] is not None:
+            # The SimHash leaves URLs out, so "Worth reading: <url>" would
+            # match every other post that says the same about another link
+            if urls and entry["urls"] and not set(urls) & set(entry["urls"]):
+                continue
+            if (simhash ^ entry["simhash"]).bit_count() <= max_distance:
+                return entry
+        elif urls and entry["urls"] == urls:
+            return entry
+    return None
+
+
+def refresh_fingerprints(
+    platform: str, fetch_timeline: Callable[[Optional[str]], List[Tuple[str, str]]]
+) -> None:
+    """
+    Read a platform's recent posts into the fingerprint index, if it's been
+    FINGERPRINT_REFRESH_INTERVAL since the last time
 
-        return False
+    fetch_timeline(since_id) returns (post ID, text) pairs, newest first.
+    """
+    refresh = fingerprint_refreshes.get(platform)
+    if refresh and time.time() - refresh["refreshed_at"] < FINGERPRINT_REFRESH_INTERVAL:
+        return
 
+    since_id = refresh["since_id"] if refresh else None
+    try:
+        timeline = fetch_timeline(since_id)
     except Exception as e:
-        print(f"Error searching X for similar posts: {str(e)}")
-        if "401" in str(e) or "Unauthorized" in str(e):
-            print("Authentication issue in search - proceeding with post attempt")
-            return False
-        return True
+        print(f"Error reading {platform} timeline for fingerprints: {e}")
+        return
 
+    for post_id, text in timeline:
+        if fingerprint_index.get(f"{platform}/{post_id}") is None:
+            record_fingerprint(platform, post_id, text)
+    fingerprint_refreshes.set(
+        platform,
+        {
+            "refreshed_at": time.time(),
+            "since_id": timeline[0][0] if timeline else since_id,
+        },
+    )
 
-def search_similar_posts_x(post: Post, api: tweepy.API) -> bool:
-    """Check if a similar post already exists on X/Twitter"""
-    search_term = post["text"][:30]
 
-    try:
-        tweets = api.user_timeline(count=20, exclude_replies=True, include_rts=False)
+def mastodon_status_text(content: str) -> str:
+    """Plain text of a Mastodon status's HTML, with links written out in full
+    (Mastodon shortens their visible text)"""
 
-        for tweet in tweets:
-            if search_term.lower() in tweet.text.lower():
-                return True
+    def replace_link(match):
+        attrs, inner = match.group(1), match.group(2)
+        href = re.search(r'href="([^"]+)"', attrs)
+        if not href or "mention" in attrs or "hashtag" in attrs:
+            return inner
+        return f" {html_unescape(href.group(1))} "
 
-        return False
+    content = re.sub(r"<a\s([^>]*)>(.*?)</a>", replace_link, content, flags=re.S)
+    content = re.sub(r"<br\s*/?>|</p>", "\n", content)
+    return html_unescape(re.sub(r"<[^<]+?>", "", content)).strip()
 
-    except Exception as e:
-        print(f"Error searching X for similar posts: {str(e)}")
-        return True  # Err on the side of caution
+
+def fetch_mastodon_timeline(
+    token: str, since_id: Optional[str]
+) -> List[Tuple[str, str]]:
+    params = {
+        "limit": FINGERPRINT_TIMELINE_LIMIT,
+        "exclude_replies": True,
+        "exclude_reblogs": True,
+    }
+    if since_id:
+        params["since_id"] = since_id
+    response = http_request(
+        "GET",
+        f"https://mastodon.social/api/v1/accounts/{MASTODON_USER_ID}/statuses",
+        headers={"Authorization": f"Bearer {token}"},
+        params=params,
+    )
+    response.raise_for_status()
+    return [
+        (status["id"], mastodon_status_text(status.get("content", "")))
+        for status in response.json()
+    ]
+
+
+def fetch_x_timeline(
+    client: tweepy.Client, user_id: str, since_id: Optional[str]
+) -> List[Tuple[str, str]]:
+    kwargs = {"since_id": since_id} if since_id else {}
+    tweets = client.get_users_tweets(
+        id=user_id,
+        max_results=FINGERPRINT_TIMELINE_LIMIT,
+        exclude=["retweets", "replies"],
+        tweet_fields=["entities"],
+        **kwargs,
+    )
+    timeline = []
+    for tweet in tweets.data or []:
+        text = tweet.text
+        # Put back the links X shortened to t.co
+        for url in (tweet.entities or {}).get("urls", []):
+            text = text.replace(url["url"], url.get("expanded_url") or url["url"])
+        timeline.append((str(tweet.id), text))
+    return timeline
+
+
+def fetch_bluesky_timeline(
+    client: Client, since_id: Optional[str]
+) -> List[Tuple[str, str]]:
+    response = client.app.bsky.feed.get_author_feed(
+        {"actor": BLUESKY_HANDLE, "limit": FINGERPRINT_TIMELINE_LIMIT}
+    )
+    timeline = []
+    for feed_post in response.feed:
+        if feed_post.post.uri == since_id:
+            break
+        if feed_post.reason or feed_post.post.record.reply:
+            continue
+        timeline.append((feed_post.post.uri, feed_post.post.record.text))
+    return timeline
 
 
-def search_similar_posts_bluesky(post: Post, client: Client) -> bool:
-    search_term = post["text"][:30]
+def _upload_cache_key(platform: str, image_hash: str, alt: Optional[str]) -> str:
+    alt_hash = hashlib.sha256((alt or "").encode("utf-8")).hexdigest()[:16]
+    return f"{platform}/{image_hash}/{alt_hash}"
 
-    try:
-        response = client.app.bsky.feed.get_author_feed(
-            {"actor": BLUESKY_HANDLE, "limit": 20}
-        )
 
-        for feed_post in response.feed:
-            if search_term.lower() in feed_post.post.record.text.lower():
-                return True
+def cached_upload(
+    platform: str,
+    image_hash: str,
+    alt: Optional[str],
+    upload: Callable[[], Optional[object]],
+):
+    """
+    Upload an image with upload(), or reuse an earlier upload of the same
+    image and alt text that the platform still accepts (see
+    UPLOAD_REUSE_TTL)
+
+    Returns:
+        The upload's JSON-serializable result, or None if it failed
+    """
+    key = _upload_cache_key(platform, image_hash, alt)
+    entry = upload_cache.get(key)
+    if entry and (entry["expires_at"] is None or entry["expires_at"] > time.time()):
+        print(f"Reusing {platform} upload of image {image_hash}")
+        return entry["result"]
+
+    result = upload()
+    if result is not None:
+        now = time.time()
+        upload_cache.set(
+            key,
+            {
+                "result": result,
+                "uploaded_at": now,
+                "expires_at": now + UPLOAD_REUSE_TTL[platform][0],
+            },
+        )
+    return result
 
-        return False
 
-    except Exception as e:
-        print(f"Error searching Bluesky for similar posts: {str(e)}")
-        return True  # Err on the side of caution
+def mark_uploads_attached(
+    platform: str, uploads: List[Tuple[str, Optional[str]]]
+) -> None:
+    """Update cached uploads of (image hash, alt text) once a post uses them"""
+    attached_ttl = UPLOAD_REUSE_TTL[platform][1]
+    for image_hash, alt in uploads:
+        key = _upload_cache_key(platform, image_hash, alt)
+        entry = upload_cache.get(key)
+        if not entry:
+            continue
+        if attached_ttl == 0:
+            upload_cache.delete(key)
+        else:
+            expires_at = (
+                None if attached_ttl is None else entry["uploaded_at"] + attached_ttl
+            )
+            if expires_at != entry["expires_at"]:
+                upload_cache.set(key, {**entry, "expires_at": expires_at})
 
 
 def upload_media_to_x(
-    image_path: str, api: tweepy.API, alt_text: Optional[str] = None
+    image_path: str,
+    api: tweepy.API,
+    alt_text: Optional[str] = None,
+    image_data: Optional[bytes] = None,
 ) -> Optional[str]:
-    """Upload an image to X/Twitter using OAuth 1.0a and return the media ID"""
+    """Upload an image to X/Twitter using OAuth 1.0a and return the media ID
+
+    image_data, when given, is uploaded instead of reading image_path.
+    """
     try:
-        media = api.media_upload(image_path)
+        if image_data is not None:
+            media = api.media_upload(image_path, file=io.BytesIO(image_data))
+        else:
+            media = api.media_upload(image_path)
 
         if alt_text:
             api.create_media_metadata(media_id=media.media_id, alt_text=alt_text)
@@ -948,9 +3557,28 @@ def upload_media_to_x(
 
 
 def upload_media_to_mastodon(
-    image_path: str, token: str, alt_text: Optional[str] = None
+    image_path: str,
+    token: str,
+    alt_text: Optional[str] = None,
+    image_data: Optional[bytes] = None,
+) -> Optional[str]:
+    """Upload an image to Mastodon and return the media ID (sync wrapper for
+    upload_media_to_mastodon_async)"""
+    return run_sync(
+        upload_media_to_mastodon_async(image_path, token, alt_text, image_data)
+    )
+
+
+async def upload_media_to_mastodon_async(
+    image_path: str,
+    token: str,
+    alt_text: Optional[str] = None,
+    image_data: Optional[bytes] = None,
 ) -> Optional[str]:
-    """Upload an image to Mastodon and return the media ID"""
+    """Upload an image to Mastodon and return the media ID
+
+    image_data, when given, is uploaded instead of reading image_path.
+    """
     url = "https://mastodon.social/api/v2/media"
 
     try:
@@ -958,57 +3586,86 @@ def upload_media_to_mastodon(
             "Authorization": f"Bearer {token}",
         }
 
-        with open(image_path, "rb") as image_file:
-            files = {"file": image_file}
-            data = {}
-            if alt_text:
-                data["description"] = alt_text
+        if image_data is None:
+            with open(image_path, "rb") as image_file:
+                image_data = image_file.read()
 
-            response = requests.post(url, headers=headers, files=files, data=data)
-            response.raise_for_status()
+        files = {"file": (os.path.basename(image_path), image_data)}
+        data = {}
+        if alt_text:
+            data["description"] = alt_text
+
+        response = await async_http_request(
+            "POST",
+            url,
+            headers=headers,
+            files=files,
+            data=data,
+            timeout=HTTP_UPLOAD_TIMEOUT,
+        )
+        response.raise_for_status()
 
-            media_data = response.json()
-            return media_data.get("id")
+        media_data = response.json()
+        return media_data.get("id")
     except Exception as e:
         print(f"Error uploading image {image_path} to Mastodon: {e}")
         return None
 
 
-def post_to_mastodon(posts: List[Post], post_dir: Optional[str] = None) -> None:
+def post_to_mastodon(posts: List[Post]) -> PublishOutcome:
     """Post a thread to Mastodon"""
+    total_posted = 0
     try:
         token = os.environ["MASTODON_ACCESS_TOKEN"]
         headers = {"Authorization": f"Bearer {token}"}
+        limiter = get_rate_limiter("mastodon")
+        issue = posts[0].get("hash") if posts else None
 
-        if posts and search_similar_posts_mastodon(posts[0], token):
-            print("Similar Mastodon post already exists. Skipping.")
-            return
-
-        if post_dir:
-            os.makedirs(post_dir, exist_ok=True)
+        resuming = publish_journal.has_published(issue, "mastodon")
+        if posts and not resuming:
+            refresh_fingerprints(
+                "mastodon", lambda since_id: fetch_mastodon_timeline(token, since_id)
+            )
+            if find_similar_post(posts[0]["text"], "mastodon"):
+                print("Similar Mastodon post already exists. Skipping.")
+                return publish_outcome("mastodon", "skipped", detail="already posted")
 
         in_reply_to_id = None
-        total_posted = 0
 
-        for post in posts:
+        for thread_index, post in enumerate(posts):
+            status_texts = split_text_into_posts(post["text"], MASTODON_CHAR_LIMIT)
+            published = [
+                publish_journal.get(issue, "mastodon", thread_index, i)
+                for i in range(len(status_texts))
+            ]
+
             media_ids = []
-            image_paths = download_images_for_post(post, post_dir)
-            for i, image_path in enumerate(image_paths):
-                alt_text = (
-                    post["images"][i].get("alt")
-                    if i < len(post.get("images", []))
-                    else None
+            uploads = []
+            artifacts = get_post_image_artifacts(post) if not published[0] else []
+            for image_info, artifact in zip(post.get("images") or [], artifacts):
+                if artifact is None:
+                    continue
+                filename, image_data = prepare_image_for_platform(artifact, "mastodon")
+                image_hash = os.path.splitext(filename)[0]
+                alt_text = image_info.get("alt")
+                media_id = cached_upload(
+                    "mastodon",
+                    image_hash,
+                    alt_text,
+                    lambda: upload_media_to_mastodon(
+                        filename, token, alt_text, image_data
+                    ),
                 )
-                media_id = upload_media_to_mastodon(image_path, token, alt_text)
                 if media_id:
                     media_ids.append(media_id)
+                    uploads.append((image_hash, alt_text))
 
-            for i, status_text in enumerate(
-                split_text_into_posts(post["text"], MASTODON_CHAR_LIMIT)
-            ):
-                if total_posted > 0:
-                    print("  Waiting 10 seconds before next post...")
-                    time.sleep(10)
+            for i, status_text in enumerate(status_texts):
+                if published[i]:
+                    in_reply_to_id = published[i]["post_id"]
+                    continue
+
+                limiter.acquire()
 
                 data = {"status": status_text}
                 if i == 0 and media_ids:
@@ -1016,53 +3673,69 @@ def post_to_mastodon(posts: List[Post], post_dir: Optional[str] = None) -> None:
                 if in_reply_to_id:
                     data["in_reply_to_id"] = in_reply_to_id
 
-                response = requests.post(
+                response = http_request(
+                    "POST",
                     "https://mastodon.social/api/v1/statuses",
                     headers=headers,
                     data=data,
                 )
+                limiter.observe(response.headers)
+                if response.status_code == 429:
+                    # Retry once the window observe() read from the headers
+                    # resets, or after a backoff if they didn't say
+                    now = time.time()
+                    retry_at = limiter.blocked_until
+                    if retry_at <= now:
+                        retry_at = now + RATE_LIMIT_MAX_WAIT
+                    raise RateLimitDeferred("mastodon", retry_at)
                 response.raise_for_status()
+                if i == 0 and media_ids:
+                    mark_uploads_attached("mastodon", uploads)
                 in_reply_to_id = response.json()["id"]
+                publish_journal.record(
+                    issue, "mastodon", thread_index, i, in_reply_to_id
+                )
+                if thread_index == 0 and i == 0:
+                    record_fingerprint("mastodon", in_reply_to_id, posts[0]["text"])
                 total_posted += 1
 
+        if resuming and total_posted == 0:
+            print("Mastodon thread already posted. Skipping.")
+            return publish_outcome("mastodon", "skipped", detail="already posted")
         print(
             f"✓ Successfully posted to Mastodon as {total_posted} post(s) in a thread"
         )
+        return publish_outcome("mastodon", "posted", total_posted)
+    except RateLimitDeferred as e:
+        print(f"Deferring the rest of the Mastodon thread: {e}")
+        return publish_outcome("mastodon", "deferred", total_posted, str(e))
     except KeyError:
         print("Warning: Missing MASTODON_ACCESS_TOKEN, so not posting to Mastodon")
+        return publish_outcome("mastodon", "skipped", detail="missing credentials")
     except Exception as e:
         print(f"An error occurred while posting to Mastodon: {str(e)}")
+        return publish_outcome("mastodon", "failed", total_posted, str(e))
 
 
-def post_to_x(posts: List[Post], post_dir: Optional[str] = None) -> None:
+def post_to_x(posts: List[Post]) -> PublishOutcome:
     """Post thread to X/Twitter - links from first post in replies, threads can have links in 2nd+ posts"""
+    total_posted = 0
     try:
-        client = tweepy.Client(
-            consumer_key=os.environ["X_CONSUMER_KEY"],
-            consumer_secret=os.environ["X_CONSUMER_SECRET"],
-            access_token=os.environ["X_ACCESS_TOKEN"],
-            access_token_secret=os.environ["X_ACCESS_TOKEN_SECRET"],
-            wait_on_rate_limit=True,
-        )
-        auth = tweepy.OAuthHandler(
-            os.environ["X_CONSUMER_KEY"], os.environ["X_CONSUMER_SECRET"]
-        )
-        auth.set_access_token(
-            os.environ["X_ACCESS_TOKEN"], os.environ["X_ACCESS_TOKEN_SECRET"]
-        )
-        api = tweepy.API(auth, wait_on_rate_limit=True)
-
-        if posts:
-            try:
-                user_id = client.get_me().data.id
-                if search_similar_posts_x_v2(posts[0], client, user_id):
-                    print("Similar X post already exists. Skipping.")
-                    return
-            except Exception as e:
-                print(f"Could not check for similar X posts, proceeding: {e}")
-
-        if post_dir:
-            os.makedirs(post_dir, exist_ok=True)
+        client, api = get_x_clients()
+        limiter = get_rate_limiter("x")
+
+        issue = posts[0].get("hash") if posts else None
+        resuming = publish_journal.has_published(issue, "x")
+        if posts and not resuming:
+            refresh_fingerprints(
+                "x",
+                lambda since_id: fetch_x_timeline(
+                    client, get_x_user_id(client), since_id
+                ),
+            )
+            if find_similar_post(posts[0]["text"], "x"):
+                print("Similar X post already exists. Skipping.")
+                return publish_outcome("x", "skipped", detail="already posted")
 
         all_links = []
         in_reply_to_tweet_id = None
@@ -1079,24 +3752,42 @@ def post_to_x(posts: List[Post], post_dir: Optional[str] = None) -> None:
                 text_to_post, links = extract_links_from_text(post["text"])
                 all_links.extend(links)
 
+            status_texts = split_text_into_posts(text_to_post, X_CHAR_LIMIT)
+            published = [
+                publish_journal.get(issue, "x", post_index, i)
+                for i in range(len(status_texts))
+            ]
+
             media_ids = []
-            image_paths = download_images_for_post(post, post_dir)[:4]
-            for i, image_path in enumerate(image_paths):
-                alt_text = (
-                    post["images"][i].get("alt")
-                    if i < len(post.get("images", []))
-                    else None
+            images = [
+                (image_info, artifact)
+                for image_info, artifact in zip(
+                    post.get("images") or [],
+                    get_post_image_artifacts(post) if not published[0] else [],
+                )
+                if artifact
+            ]
+            uploads = []
+            for image_info, artifact in images[:4]:
+                filename, image_data = prepare_image_for_platform(artifact, "x")
+                image_hash = os.path.splitext(filename)[0]
+                alt_text = image_info.get("alt")
+                media_id = cached_upload(
+                    "x",
+                    image_hash,
+                    alt_text,
+                    lambda: upload_media_to_x(filename, api, alt_text, image_data),
                 )
-                media_id = upload_media_to_x(image_path, api, alt_text)
                 if media_id:
                     media_ids.append(media_id)
+                    uploads.append((image_hash, alt_text))
 
-            for i, status_text in enumerate(
-                split_text_into_posts(text_to_post, X_CHAR_LIMIT)
-            ):
-                if text_posts_count > 0:
-                    print("  Waiting 10 seconds before next post...")
-                    time.sleep(10)
+            for i, status_text in enumerate(status_texts):
+                if published[i]:
+                    in_reply_to_tweet_id = published[i]["post_id"]
+                    continue
+
+                limiter.acquire()
 
                 kwargs = {"text": status_text}
                 if i == 0 and media_ids:
@@ -1105,74 +3796,114 @@ def post_to_x(posts: List[Post], post_dir: Optional[str] = None) -> None:
                     kwargs["in_reply_to_tweet_id"] = in_reply_to_tweet_id
 
                 response = client.create_tweet(**kwargs)
+                if i == 0 and media_ids:
+                    mark_uploads_attached("x", uploads)
                 in_reply_to_tweet_id = response.data["id"]
+                publish_journal.record(issue, "x", post_index, i, in_reply_to_tweet_id)
+                if post_index == 0 and i == 0:
+                    record_fingerprint("x", in_reply_to_tweet_id, posts[0]["text"])
                 text_posts_count += 1
+                total_posted += 1
+
+        # Link replies are journaled as if they were one more post
+        for i, link in enumerate(all_links):
+            published = publish_journal.get(issue, "x", len(posts), i)
+            if published:
+                in_reply_to_tweet_id = published["post_id"]
+                continue
 
-        for link in all_links:
-            print("  Waiting 10 seconds before next post...")
-            time.sleep(10)
+            limiter.acquire()
 
             response = client.create_tweet(
                 text=link, in_reply_to_tweet_id=in_reply_to_tweet_id
             )
             in_reply_to_tweet_id = response.data["id"]
+            publish_journal.record(issue, "x", len(posts), i, in_reply_to_tweet_id)
+            total_posted += 1
 
-        total = text_posts_count + len(all_links)
-        print(f"✓ Successfully posted to X as {total} post(s) in a thread")
+        if resuming and total_posted == 0:
+            print("X thread already posted. Skipping.")
+            return publish_outcome("x", "skipped", detail="already posted")
+        print(f"✓ Successfully posted to X as {total_posted} post(s) in a thread")
         if all_links:
             print(f"  ({text_posts_count} text posts + {len(all_links)} link replies)")
+        return publish_outcome("x", "posted", total_posted)
+    except (RateLimitDeferred, tweepy.TooManyRequests) as e:
+        print(f"Deferring the rest of the X thread: {e}")
+        return publish_outcome("x", "deferred", total_posted, str(e))
     except KeyError:
         print("Warning: Missing X API credentials, so not posting to X")
+        return publish_outcome("x", "skipped", detail="missing credentials")
     except Exception as e:
         print(f"An error occurred while posting to X: {str(e)}")
+        return publish_outcome("x", "failed", total_posted, str(e))
 
 
-def post_to_bluesky(posts: List[Post], post_dir: Optional[str] = None) -> None:
+def post_to_bluesky(posts: List[Post]) -> PublishOutcome:
     """Post thread to Bluesky with images or link cards"""
+    total_posted = 0
     try:
-        client = Client()
-        client.login(BLUESKY_HANDLE, os.environ["BLUESKY_APP_PASSWORD"])
-
-        if posts and search_similar_posts_bluesky(posts[0], client):
-            print("Similar Bluesky post already exists. Skipping.")
-            return
-
-        if post_dir:
-            os.makedirs(post_dir, exist_ok=True)
+        limiter = get_rate_limiter("bluesky")
+        client = get_bluesky_client()
+        issue = posts[0].get("hash") if posts else None
+
+        resuming = publish_journal.has_published(issue, "bluesky")
+        if posts and not resuming:
+            refresh_fingerprints(
+                "bluesky", lambda since_id: fetch_bluesky_timeline(client, since_id)
+            )
+            if find_similar_post(posts[0]["text"], "bluesky"):
+                print("Similar Bluesky post already exists. Skipping.")
+                return publish_outcome("bluesky", "skipped", detail="already posted")
 
         reply_to = None
-        total_posted = 0
 
-        for post in posts:
-            if total_posted > 0:
-                print("  Waiting 10 seconds before next post...")
-                time.sleep(10)
+        for thread_index, post in enumerate(posts):
+            published = publish_journal.get(issue, "bluesky", thread_index, 0)
+            if published:
+                ref = {"uri": published["post_id"], "cid": published["cid"]}
+                reply_to = {
+                    "root": reply_to["root"] if reply_to else ref,
+                    "parent": ref,
+                }
+                continue
 
             tb, first_url = build_bluesky_text_with_links(post["text"])
             embed = None
 
+            uploads = []
             if post.get("images"):
                 images_to_embed = []
-                image_paths = download_images_for_post(post, post_dir)
-                for i, image_path in enumerate(image_paths):
+                artifacts = get_post_image_artifacts(post)
+                for image_info, artifact in zip(post["images"], artifacts):
+                    if artifact is None:
+                        continue
                     try:
-                        with open(image_path, "rb") as f:
-                            image_data = f.read()
-
-                        with Image.open(io.BytesIO(image_data)) as img:
-                            width, height = img.size
-
-                        upload_response = client.upload_blob(image_data)
-                        alt_text = (
-                            post["images"][i].get("alt", "")
-                            if i < len(post["images"])
-                            else ""
+                        filename, image_data = prepare_image_for_platform(
+                            artifact, "bluesky"
                         )
+                        dimensions = image_dimensions(image_info, filename)
+                        if dimensions is None:
+                            manifest = describe_image(filename, image_data)
+                            dimensions = (manifest["width"], manifest["height"])
+                        width, height = dimensions
+
+                        # Blobs don't carry alt text, so any upload will do
+                        image_hash = os.path.splitext(filename)[0]
+                        blob = cached_upload(
+                            "bluesky",
+                            image_hash,
+                            None,
+                            lambda: client.upload_blob(image_data).blob.model_dump(
+                                mode="json", by_alias=True
+                            ),
+                        )
+                        uploads.append((image_hash, None))
 
                         images_to_embed.append(
                             {
-                                "alt": alt_text,
-                                "image": upload_response.blob,
+                                "alt": image_info.get("alt") or "",
+                                "image": models.blob_ref.BlobRef.model_validate(blob),
                                 "aspectRatio": {"width": width, "height": height},
                             }
                         )
@@ -1186,12 +3917,19 @@ def post_to_bluesky(posts: List[Post], post_dir: Optional[str] = None) -> None:
                     }
 
             elif first_url:
-                embed = create_bluesky_link_card(first_url, client)
+                embed = create_bluesky_link_card(first_url, client, uploads)
 
             kwargs = {"reply_to": reply_to} if reply_to else {}
             if embed:
                 kwargs["embed"] = embed
+            limiter.acquire()
             response = client.send_post(tb, **kwargs)
+            mark_uploads_attached("bluesky", uploads)
+            publish_journal.record(
+                issue, "bluesky", thread_index, 0, response.uri, response.cid
+            )
+            if thread_index == 0:
+                record_fingerprint("bluesky", response.uri, posts[0]["text"])
 
             reply_to = {
                 "root": reply_to["root"]
@@ -1201,11 +3939,20 @@ def post_to_bluesky(posts: List[Post], post_dir: Optional[str] = None) -> None:
             }
             total_posted += 1
 
+        if resuming and total_posted == 0:
+            print("Bluesky thread already posted. Skipping.")
+            return publish_outcome("bluesky", "skipped", detail="already posted")
         print(f"✓ Successfully posted to Bluesky as {total_posted} post(s) in a thread")
+        return publish_outcome("bluesky", "posted", total_posted)
+    except (RateLimitDeferred, RateLimitExceededError) as e:
+        print(f"Deferring the rest of the Bluesky thread: {e}")
+        return publish_outcome("bluesky", "deferred", total_posted, str(e))
     except KeyError:
         print("Warning: Missing BLUESKY_APP_PASSWORD, so not posting to Bluesky")
+        return publish_outcome("bluesky", "skipped", detail="missing credentials")
     except Exception as e:
         print(f"An error occurred while posting to Bluesky: {str(e)}")
+        return publish_outcome("bluesky", "failed", total_posted, str(e))
 
 
 def parse_args():
@@ -1254,6 +4001,12 @@ Examples:
         help="Force reposting even if post already exists",
     )
 
+    parser.add_argument(
+        "--optimize-images",
+        action="store_true",
+        help="Recompress blog images and add responsive variants",
+    )
+
     return parser.parse_args()
 
 
@@ -1287,21 +4040,34 @@ def main() -> None:
                 test_mode=args.test,
                 force=args.force,
                 specific_issue=args.issue is not None,
+                optimize_images=args.optimize_images,
             )
 
+        # Deferred and failed threads keep the issue open so the next run
+        # resumes them from publish_journal
+        unfinished = []
         if social_platforms:
             social_posts = convert_issue_to_post(issue, for_social=True)
-            post_to_social_media(
+            outcomes = post_to_social_media(
                 social_posts,
                 platforms=social_platforms,
                 test_mode=args.test,
                 force=args.force,
                 specific_issue=args.issue is not None,
             )
+            unfinished = [
+                o["platform"] for o in outcomes if o["status"] in ("deferred", "failed")
+            ]
 
-        if not args.test:
+        if unfinished:
+            print(f"Issue #{issue.number}: Leaving open, unfinished on: {unfinished}")
+        elif not args.test:
             issue.edit(state="closed")
 
+        reset_image_artifacts()
+
+    print_metadata_failure_summary()
+
 
 if __name__ == "__main__":
     main()
@@ -20,7 +20,18 @@ const common = z
       .array(
         z.object({
           src: z.string(),
-          params: z.object({ alt: z.string().optional() }).optional(),
+          params: z
+            .object({
+              alt: z.string().optional(),
+              // Recorded by update_links.py from its image manifest
+              width: z.number().optional(),
+              height: z.number().optional(),
+              // A tiny data: URI thumbnail to show while the image loads
+              placeholder: z.string().optional(),
+              // Set on images optimized by update_links.py --optimize-images
+              variants: z.array(z.object({ src: z.string(), width: z.number() })).optional(),
+            })
+            .optional(),
         }),
       )
       .optional(),
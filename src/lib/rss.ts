@@ -38,7 +38,9 @@ function imagesHtml(entry: FeedEntry): string {
       if (!url) return ""
       const resource = entry.data.resources?.find((item) => item.src === src)
       const alt = resource?.params?.alt ?? ""
-      return `<img src="${escapeAttr(absoluteUrl(url))}" alt="${escapeAttr(alt)}" />`
+      const { width, height } = resource?.params ?? {}
+      const size = width && height ? ` width="${width}" height="${height}"` : ""
+      return `<img src="${escapeAttr(absoluteUrl(url))}" alt="${escapeAttr(alt)}"${size} />`
     })
     .join("")
 }
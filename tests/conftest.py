@@ -0,0 +1,120 @@
+import http.server
+import json
+import threading
+
+import httpx
+import pytest
+
+from scripts import update_links
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep every test's caches out of the repo's committed cache directory"""
+    monkeypatch.setattr(update_links, "CACHE_DIR", str(tmp_path / "cache"))
+    update_links.reset_caches()
+    update_links.reset_metadata_failure_stats()
+    update_links.reset_image_artifacts()
+    update_links.reset_rate_limiters()
+    update_links.reset_clients()
+    yield
+    update_links.reset_caches()
+    update_links.reset_metadata_failure_stats()
+    update_links.reset_image_artifacts()
+    update_links.reset_rate_limiters()
+    update_links.reset_clients()
+    update_links.reset_local_content_index()
+
+
+class MockHttp:
+    """Canned responses for the async HTTP client, keyed by URL"""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+
+    def add(self, url, status_code=200, handler=None, **response_kwargs):
+        """Serve `url` with httpx.Response(status_code, **response_kwargs), or
+        with `handler(request)` when one is given"""
+        self.routes[update_links.normalize_url(url)] = handler or (
+            lambda request: httpx.Response(status_code, **response_kwargs)
+        )
+
+    @property
+    def call_count(self):
+        return len(self.requests)
+
+    def __call__(self, request):
+        self.requests.append(request)
+        handler = self.routes.get(update_links.normalize_url(str(request.url)))
+        return handler(request) if handler else httpx.Response(404)
+
+
+@pytest.fixture(autouse=True)
+def mock_http(monkeypatch):
+    """Route async HTTP requests to a MockHttp instead of the network"""
+    mock = MockHttp()
+    monkeypatch.setattr(update_links, "ASYNC_HTTP_TRANSPORT", httpx.MockTransport(mock))
+    update_links.reset_async_http_clients()
+    yield mock
+    update_links.reset_async_http_clients()
+
+
+class LocalServer:
+    """A local HTTP server standing in for a remote API
+
+    `routes` maps a path (without query string) to a (status, headers, body)
+    tuple; every request's path and query string is kept in `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def _respond(self, include_body=True):
+                server.requests.append(self.path)
+                route = server.routes.get(self.path.split("?")[0])
+                status, headers, body = route or (404, {}, b"")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if include_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond()
+
+            def do_HEAD(self):
+                self._respond(include_body=False)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+
+    def add_json(self, path, data, status=200):
+        self.routes[path] = (
+            status,
+            {"Content-Type": "application/json"},
+            json.dumps(data).encode("utf-8"),
+        )
+
+
+@pytest.fixture
+def local_server(monkeypatch):
+    """Serve real HTTP from a LocalServer, bypassing mock_http"""
+    server = LocalServer()
+    server.thread.start()
+    monkeypatch.setattr(update_links, "ASYNC_HTTP_TRANSPORT", None)
+    update_links.reset_async_http_clients()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -1,6 +1,11 @@
 import pytest
+import base64
+import hashlib
+import io
 import os
 import json
+import shutil
+import httpx
 from unittest.mock import patch, MagicMock
 from scripts.update_links import (
     get_url_metadata,
@@ -33,7 +38,7 @@ def test_slugify():
         slugify(".")
 
 
-def test_get_url_metadata():
+def test_get_url_metadata(mock_http):
     """Test URL metadata extraction"""
     html_content = """
     <html>
@@ -44,24 +49,83 @@ def test_get_url_metadata():
         </head>
     </html>
     """
+    mock_http.add("https://example.com", text=html_content)
 
-    with patch("requests.get") as mock_get:
-        mock_response = MagicMock()
-        mock_response.text = html_content
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+    # Test OG title priority
+    metadata = get_url_metadata("https://example.com")
+    assert metadata["title"] == "OG Title"
 
-        # Test OG title priority
-        metadata = get_url_metadata("https://example.com")
-        assert metadata["title"] == "OG Title"
+    # Test fallback to HTML title
+    html_content_no_meta = "<html><head><title>Only HTML Title</title></head></html>"
+    mock_http.add("https://example.com/other", text=html_content_no_meta)
+    metadata = get_url_metadata("https://example.com/other")
+    assert metadata["title"] == "Only HTML Title"
 
-        # Test fallback to HTML title
-        html_content_no_meta = (
-            "<html><head><title>Only HTML Title</title></head></html>"
-        )
-        mock_response.text = html_content_no_meta
-        metadata = get_url_metadata("https://example.com")
-        assert metadata["title"] == "Only HTML Title"
+
+def test_get_url_metadata_uses_cache(mock_http):
+    """Test that fresh cached metadata is served without a request"""
+    mock_http.add(
+        "https://example.com/article",
+        text="<html><head><title>Cached Title</title></head></html>",
+    )
+
+    assert get_url_metadata("https://example.com/article")["title"] == "Cached Title"
+    # Same page once normalized: host case and fragment don't matter
+    assert (
+        get_url_metadata("https://EXAMPLE.com/article#top")["title"] == "Cached Title"
+    )
+    assert mock_http.call_count == 1
+
+
+def test_get_url_metadata_revalidates_stale_entries(mock_http):
+    """Test that stale entries are revalidated with a conditional request"""
+    from scripts.update_links import url_metadata_cache
+
+    url_metadata_cache.set(
+        "https://example.com/article",
+        {
+            "title": "Old Title",
+            "description": None,
+            "image": None,
+            "fetched_at": 0,
+            "etag": '"abc"',
+            "last_modified": None,
+        },
+    )
+    mock_http.add("https://example.com/article", status_code=304)
+
+    metadata = get_url_metadata("https://example.com/article")
+
+    assert metadata["title"] == "Old Title"
+    assert mock_http.requests[-1].headers["If-None-Match"] == '"abc"'
+    assert url_metadata_cache.get("https://example.com/article")["fetched_at"] > 0
+
+
+def test_get_url_metadata_falls_back_to_stale_entry_on_error(mock_http, monkeypatch):
+    """Test that a failed revalidation still returns the stale entry"""
+    from scripts import update_links
+    from scripts.update_links import url_metadata_cache
+
+    url_metadata_cache.set(
+        "https://example.com/article",
+        {"title": "Old Title", "fetched_at": 0},
+    )
+    monkeypatch.setattr(update_links, "HTTP_BACKOFF_FACTOR", 0)
+    mock_http.add("https://example.com/article", status_code=500)
+
+    assert get_url_metadata("https://example.com/article")["title"] == "Old Title"
+
+
+def test_normalize_url():
+    """Test that equivalent URLs share a cache key"""
+    from scripts.update_links import normalize_url
+
+    assert normalize_url("HTTPS://Example.COM") == "https://example.com/"
+    assert (
+        normalize_url("https://example.com:443/a?b=1#c") == "https://example.com/a?b=1"
+    )
+    assert normalize_url("http://example.com:80/a") == "http://example.com/a"
+    assert normalize_url("https://example.com:8443/a") == "https://example.com:8443/a"
 
 
 def test_extract_images_from_issue():
@@ -331,8 +395,11 @@ def test_download_post_images():
     }
 
     with patch("scripts.update_links.download_image") as mock_download:
-        # Mock successful downloads
-        mock_download.side_effect = ["downloaded1.jpg", "downloaded2.png"]
+        # Mock successful downloads (concurrent, so map by URL, not call order)
+        mock_download.side_effect = lambda url, dest: {
+            "https://example.com/image1.jpg": "downloaded1.jpg",
+            "https://example.com/image2.png": "downloaded2.png",
+        }[url]
         result = download_post_images(test_post_with_images, "/tmp/test")
 
         assert result == ["downloaded1.jpg", "downloaded2.png"]
@@ -887,6 +954,63 @@ Also see: https://example.com/second-link"""
             assert card["external"]["uri"] == "https://example.com/first-link"
 
 
+def test_link_card_thumbnail_made_and_uploaded_once(mock_http, monkeypatch):
+    """Test that og:images are scaled down once and their blob reused"""
+    from atproto import models
+    from PIL import Image
+
+    from scripts import update_links
+    from scripts.update_links import create_bluesky_link_card
+
+    monkeypatch.setattr(
+        update_links,
+        "get_url_metadata",
+        lambda url: {"title": "Article", "image": "https://example.com/og.png"},
+    )
+    mock_http.add("https://example.com/og.png", content=noisy_png((2400, 1260)))
+    client = MagicMock()
+    client.send_post.return_value = MagicMock(uri="at://post/1", cid="cid1")
+    client.upload_blob.return_value.blob = models.blob_ref.BlobRef(
+        mime_type="image/jpeg", size=1, ref={"$link": "bafkrei"}
+    )
+
+    uploads = []
+    card = create_bluesky_link_card("https://example.com/a", client, uploads)
+    update_links.mark_uploads_attached("bluesky", uploads)
+    again = create_bluesky_link_card("https://example.com/a?utm_source=x", client)
+
+    assert card["external"]["thumb"].ref.link == "bafkrei"
+    assert again["external"]["thumb"].ref.link == "bafkrei"
+    assert client.upload_blob.call_count == 1
+    assert mock_http.call_count == 1
+
+    thumbnail = client.upload_blob.call_args.args[0]
+    with Image.open(io.BytesIO(thumbnail)) as img:
+        assert img.format == "JPEG"
+        assert img.size == (1000, 525)
+    assert uploads == [(hashlib.sha256(thumbnail).hexdigest(), None)]
+
+
+def test_link_card_thumbnail_remade_when_og_image_changes(mock_http, monkeypatch):
+    """Test that a page's new og:image gets a new thumbnail"""
+    from scripts import update_links
+    from scripts.update_links import get_link_card_thumbnail
+
+    mock_http.add("https://example.com/old.png", content=noisy_png((20, 20)))
+    mock_http.add("https://example.com/new.png", content=noisy_png((20, 20)))
+
+    old = get_link_card_thumbnail(
+        "https://example.com/a", "https://example.com/old.png"
+    )
+    new = get_link_card_thumbnail(
+        "https://example.com/a", "https://example.com/new.png"
+    )
+
+    assert old["sha256"] != new["sha256"]
+    assert new["image"] == "https://example.com/new.png"
+    assert update_links.link_thumbnail_index.get("https://example.com/a") == new
+
+
 class TestPlatformExclusion:
     """Tests for platform exclusion based on labels"""
 
@@ -1421,3 +1545,1860 @@ def test_process_issue_text_for_blog_strips_trailing_punctuation(mock_get_metada
     # The trailing punctuation is removed with the URL
     assert result == "Check this: \n\n[Article Title](https://example.com/article)"
     mock_get_metadata.assert_called_once_with("https://example.com/article")
+
+
+@patch("scripts.update_links.get_url_metadata")
+def test_process_issue_text_for_blog_fetches_each_url_once(mock_get_metadata):
+    """Test that repeated URLs are fetched once and substituted in order"""
+    from scripts.update_links import process_issue_text_for_blog
+
+    mock_get_metadata.side_effect = lambda url: {"title": f"Title for {url[-1]}"}
+
+    text = "See https://example.com/a, https://example.com/b and https://example.com/a."
+    result = process_issue_text_for_blog(text, {})
+
+    assert result == (
+        "See \n\n[Title for a](https://example.com/a)"
+        " \n\n[Title for b](https://example.com/b)"
+        " and \n\n[Title for a](https://example.com/a)"
+    )
+    assert mock_get_metadata.call_count == 2
+
+
+def test_prefetch_url_metadata_limits_requests_per_host():
+    """Test that prefetching runs concurrently but caps requests per host"""
+    import threading
+    import time
+
+    from scripts import update_links
+
+    lock = threading.Lock()
+    in_flight = {}
+    peak = {}
+
+    def fake_get_url_metadata(url):
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        time.sleep(0.05)
+        with lock:
+            in_flight[host] -= 1
+        return {"title": url}
+
+    urls = [f"https://one.com/{i}" for i in range(6)] + [
+        f"https://two.com/{i}" for i in range(6)
+    ]
+    with patch.object(update_links, "get_url_metadata", fake_get_url_metadata):
+        results = update_links.prefetch_url_metadata(urls)
+
+    assert list(results) == urls
+    assert all(results[url]["title"] == url for url in urls)
+    assert peak["one.com"] <= update_links.MAX_REQUESTS_PER_HOST
+    assert peak["two.com"] <= update_links.MAX_REQUESTS_PER_HOST
+    assert peak["one.com"] + peak["two.com"] > 2
+
+
+def test_get_url_metadata_reads_only_the_head(mock_http):
+    """Test that the page body after </head> is never downloaded"""
+    from scripts.update_links import METADATA_CHUNK_SIZE
+
+    head = b"<html><head><title>Head Title</title></HEAD>"
+    rest = b"<body>" + b"x" * METADATA_CHUNK_SIZE * 2
+    consumed = []
+
+    async def body():
+        for chunk in [head[:20], head[20:], rest, b"never read"]:
+            consumed.append(chunk)
+            yield chunk
+
+    mock_http.add("https://example.com/big", content=body())
+
+    metadata = get_url_metadata("https://example.com/big")
+
+    assert metadata["title"] == "Head Title"
+    assert b"never read" not in consumed
+
+
+def test_read_html_head():
+    """Test that reading stops at </head> or the byte cap"""
+    import asyncio
+
+    from scripts.update_links import read_html_head
+
+    def read(chunks, **kwargs):
+        async def iterate():
+            for chunk in chunks:
+                yield chunk
+
+        return asyncio.run(read_html_head(iterate(), **kwargs))
+
+    # Tag split across chunks
+    assert read([b"<head><title>t</ti", b"tle></he", b"ad><body>"]) == (
+        b"<head><title>t</title></head>"
+    )
+    assert read([b"a" * 10, b"b" * 10], max_bytes=15) == b"a" * 10 + b"b" * 5
+    assert read([b"<title>no head</title>"]) == b"<title>no head</title>"
+
+
+def test_sniff_charset():
+    """Test charset detection from the header and from <meta> tags"""
+    from scripts.update_links import sniff_charset
+
+    assert sniff_charset("text/html; charset=ISO-8859-1", b"") == "iso8859-1"
+    assert sniff_charset("text/html", b'<meta charset="windows-1252">') == "cp1252"
+    assert (
+        sniff_charset(
+            None,
+            b'<meta http-equiv="Content-Type" content="text/html; charset=shift_jis">',
+        )
+        == "shift_jis"
+    )
+    assert sniff_charset("text/html; charset=bogus", b"") == "utf-8"
+    assert sniff_charset(None, b"<title>x</title>") == "utf-8"
+
+
+def test_get_url_metadata_decodes_declared_charset(mock_http):
+    """Test that pages are decoded using their <meta charset>"""
+    html = '<html><head><meta charset="iso-8859-1"><title>Café</title></head>'
+    mock_http.add(
+        "https://example.com/latin",
+        content=html.encode("latin-1"),
+        headers={"Content-Type": "text/html"},
+    )
+
+    assert get_url_metadata("https://example.com/latin")["title"] == "Café"
+
+
+def test_accepted_encodings_only_lists_installed_codecs():
+    """Test that br/zstd are only advertised when they can be decoded"""
+    from scripts import update_links
+
+    with patch.object(update_links.importlib.util, "find_spec", return_value=None):
+        assert update_links.accepted_encodings() == "gzip, deflate"
+
+    with patch.object(update_links.importlib.util, "find_spec", return_value=True):
+        assert update_links.accepted_encodings() == "gzip, deflate, br, zstd"
+
+
+def test_extract_html_metadata_fallback_order():
+    """Test that og:* wins over twitter:* and plain tags, as before"""
+    from scripts.update_links import extract_html_metadata
+
+    html = """<html><head>
+        <title> Plain Title </title>
+        <meta name="description" content="Plain description">
+        <meta name="twitter:description" content="Twitter description">
+        <meta name="twitter:image" content="https://cdn.example.com/twitter.png">
+        <meta property="og:image" content="/og.png">
+        <meta property="og:image" content="/second.png">
+    </head><body></body></html>"""
+
+    assert extract_html_metadata(html, "https://example.com/post/1") == {
+        "title": "Plain Title",
+        "description": "Twitter description",
+        "image": "https://example.com/og.png",
+    }
+
+    assert extract_html_metadata(
+        '<meta name="description" content="Only &amp; description">',
+        "https://example.com/",
+    ) == {"title": None, "description": "Only & description", "image": None}
+
+
+def test_extract_html_metadata_stops_at_head():
+    """Test that tags after the head are ignored"""
+    from scripts.update_links import extract_html_metadata
+
+    html = """<html><head><title>Head</title></head>
+    <body><meta property="og:title" content="Body Meta"><title>SVG</title></body>"""
+    assert extract_html_metadata(html, "https://example.com/")["title"] == "Head"
+
+    # An unclosed head ends at <body>
+    html = """<html><head><title>Head</title>
+    <body><meta property="og:title" content="Body Meta">"""
+    assert extract_html_metadata(html, "https://example.com/")["title"] == "Head"
+
+
+def test_http_session_is_shared_and_retries_idempotent_requests():
+    """Test that all requests share one pooled session with retries"""
+    from scripts import update_links
+
+    session = update_links.get_http_session()
+    assert update_links.get_http_session() is session
+
+    retry = session.get_adapter("https://example.com").max_retries
+    assert retry.total == update_links.HTTP_RETRIES
+    assert "GET" in retry.allowed_methods
+    assert "POST" not in retry.allowed_methods
+
+
+def test_http_request_applies_default_timeout():
+    """Test that http_request adds the standard timeout"""
+    from scripts import update_links
+
+    with patch.object(update_links.get_http_session(), "request") as mock_request:
+        update_links.http_request("GET", "https://example.com")
+        update_links.http_request("POST", "https://example.com", timeout=60)
+
+    assert mock_request.call_args_list[0].kwargs["timeout"] == update_links.HTTP_TIMEOUT
+    assert mock_request.call_args_list[1].kwargs["timeout"] == 60
+
+
+def test_async_api_overlaps_fetches_in_one_loop(mock_http):
+    """Test that async callers can await many fetches concurrently"""
+    import asyncio
+
+    from scripts.update_links import get_async_http_client, get_url_metadata_async
+
+    for i in range(5):
+        mock_http.add(
+            f"https://example.com/{i}", html=f"<head><title>Page {i}</title></head>"
+        )
+
+    async def fetch_all():
+        results = await asyncio.gather(
+            *(get_url_metadata_async(f"https://example.com/{i}") for i in range(5))
+        )
+        return results, get_async_http_client()
+
+    results, client = asyncio.run(fetch_all())
+
+    assert [r["title"] for r in results] == [f"Page {i}" for i in range(5)]
+    assert client.follow_redirects
+
+
+def test_async_http_request_retries_idempotent_requests(mock_http, monkeypatch):
+    """Test that GETs are retried on 5xx but POSTs are not"""
+    import asyncio
+
+    import httpx
+
+    from scripts import update_links
+
+    monkeypatch.setattr(update_links, "HTTP_BACKOFF_FACTOR", 0)
+    statuses = iter([503, 200])
+    mock_http.add(
+        "https://example.com/flaky",
+        handler=lambda request: httpx.Response(next(statuses)),
+    )
+    mock_http.add("https://example.com/post", status_code=503)
+
+    response = asyncio.run(
+        update_links.async_http_request("GET", "https://example.com/flaky")
+    )
+    assert response.status_code == 200
+
+    response = asyncio.run(
+        update_links.async_http_request("POST", "https://example.com/post")
+    )
+    assert response.status_code == 503
+    assert mock_http.call_count == 3
+
+
+def test_retry_after_is_capped(mock_http, monkeypatch):
+    """Test that a huge Retry-After only waits HTTP_BACKOFF_MAX per retry"""
+    import asyncio
+
+    from urllib3 import HTTPResponse
+
+    from scripts import update_links
+
+    waits = []
+
+    async def sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(update_links.asyncio, "sleep", sleep)
+    mock_http.add(
+        "https://example.com/busy", status_code=429, headers={"Retry-After": "86400"}
+    )
+
+    response = asyncio.run(
+        update_links.async_http_request("GET", "https://example.com/busy")
+    )
+
+    assert response.status_code == 429
+    assert waits == [update_links.HTTP_BACKOFF_MAX] * update_links.HTTP_RETRIES
+
+    retry = update_links.get_http_session().get_adapter("https://x").max_retries
+    busy = HTTPResponse(status=429, headers={"Retry-After": "86400"})
+    assert retry.get_retry_after(busy) == update_links.HTTP_BACKOFF_MAX
+    assert retry.new(total=1).get_retry_after(busy) == update_links.HTTP_BACKOFF_MAX
+
+
+def test_download_image_async(mock_http, tmp_path):
+    """Test that images are saved under their content hash"""
+    import asyncio
+    import hashlib
+
+    from scripts.update_links import download_image_async
+
+    mock_http.add("https://example.com/photo.png", content=b"png bytes")
+
+    filename = asyncio.run(
+        download_image_async("https://example.com/photo.png", str(tmp_path))
+    )
+
+    assert filename == hashlib.sha256(b"png bytes").hexdigest() + ".png"
+    assert (tmp_path / filename).read_bytes() == b"png bytes"
+
+
+def test_download_image_reuses_known_urls_without_network(mock_http, tmp_path):
+    """Test that an indexed image is linked into another post with no fetch"""
+    from scripts import update_links
+    from scripts.update_links import download_image
+
+    url = "https://github.com/user-attachments/assets/abc"
+    mock_http.add(url, content=b"png bytes", headers={"content-type": "image/png"})
+
+    first = download_image(url, str(tmp_path / "post-1"))
+    second = download_image(url, str(tmp_path / "post-2"))
+
+    assert first == second
+    assert mock_http.call_count == 1
+    assert (tmp_path / "post-2" / second).read_bytes() == b"png bytes"
+    entry = update_links.image_index.get(url)
+    assert entry["size"] == len(b"png bytes")
+    assert entry["paths"] == sorted(
+        os.path.normpath(str(tmp_path / post / first)) for post in ["post-1", "post-2"]
+    )
+
+
+def test_download_image_falls_back_to_committed_copies(mock_http, tmp_path):
+    """Test that without the store (a fresh checkout), a post's copy is used"""
+    from scripts import update_links
+    from scripts.update_links import download_image
+
+    url = "https://example.com/shot.png"
+    mock_http.add(url, content=b"png bytes")
+    filename = download_image(url, str(tmp_path / "post-1"))
+
+    shutil.rmtree(os.path.join(update_links.CACHE_DIR, update_links.IMAGE_STORE_DIR))
+    update_links.reset_caches()
+
+    assert download_image(url, str(tmp_path / "post-2")) == filename
+    assert mock_http.call_count == 1
+
+    # The store was restored from the post's copy
+    store = os.path.join(update_links.CACHE_DIR, update_links.IMAGE_STORE_DIR)
+    assert os.listdir(store) == [filename]
+
+    # With every copy gone, the image is downloaded again
+    shutil.rmtree(store)
+    shutil.rmtree(tmp_path / "post-1")
+    shutil.rmtree(tmp_path / "post-2")
+    assert download_image(url, str(tmp_path / "post-3")) == filename
+    assert mock_http.call_count == 2
+
+
+def test_download_image_sniffs_extension_from_content(mock_http, tmp_path):
+    """Test that the file extension comes from the image bytes, not the URL"""
+    from scripts.update_links import download_image
+
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+    mock_http.add(
+        "https://example.com/photo.jpg",
+        content=png,
+        headers={"content-type": "image/jpeg"},
+    )
+
+    filename = download_image("https://example.com/photo.jpg", str(tmp_path))
+
+    assert filename.endswith(".png")
+    assert (tmp_path / filename).read_bytes() == png
+
+
+@pytest.mark.parametrize(
+    "head,expected",
+    [
+        (b"\xff\xd8\xff\xe0" + b"\x00" * 8, ".jpg"),
+        (b"GIF89a" + b"\x00" * 6, ".gif"),
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", ".webp"),
+        (b"\x00\x00\x00\x1cftypavif", ".avif"),
+    ],
+)
+def test_sniff_image_extension(head, expected):
+    """Test that common image formats are recognized by signature"""
+    from scripts.update_links import sniff_image_extension
+
+    assert sniff_image_extension(head, "https://example.com/x.png") == expected
+
+
+def test_sniff_image_extension_falls_back():
+    """Test the URL, then Content-Type, then .jpg fallbacks"""
+    from scripts.update_links import sniff_image_extension
+
+    assert sniff_image_extension(b"<svg", "https://example.com/x.svg") == ".svg"
+    assert sniff_image_extension(b"", "https://example.com/x", "image/gif") == ".gif"
+    assert sniff_image_extension(b"", "https://example.com/x") == ".jpg"
+
+
+def test_download_image_enforces_size_limit(mock_http, tmp_path, monkeypatch):
+    """Test that oversized images are abandoned without leaving files behind"""
+    from scripts import update_links
+    from scripts.update_links import download_image
+
+    monkeypatch.setattr(update_links, "MAX_IMAGE_BYTES", 1000)
+
+    async def body():
+        for _ in range(10):
+            yield b"x" * 500
+
+    # Streamed, so there's no Content-Length to reject up front
+    mock_http.add("https://example.com/huge.png", content=body())
+    mock_http.add("https://example.com/declared.png", content=b"x" * 2000)
+
+    assert download_image("https://example.com/huge.png", str(tmp_path)) is None
+    assert download_image("https://example.com/declared.png", str(tmp_path)) is None
+    store = os.path.join(update_links.CACHE_DIR, update_links.IMAGE_STORE_DIR)
+    assert os.listdir(store) == []
+    assert update_links.image_index.get("https://example.com/huge.png") is None
+
+
+def test_image_artifacts_download_each_image_once(mock_http, tmp_path, monkeypatch):
+    """Test that the blog and every platform share one download per image"""
+    from scripts import update_links
+    from scripts.update_links import (
+        download_images_for_post,
+        download_post_images,
+        get_image_artifact,
+    )
+
+    download = MagicMock(wraps=update_links.download_image)
+    monkeypatch.setattr(update_links, "download_image", download)
+    mock_http.add("https://example.com/a.png", content=b"a bytes")
+    mock_http.add("https://example.com/missing.png", status_code=404)
+    post = {
+        "images": [
+            {"src": "https://example.com/a.png", "alt": "A"},
+            {"src": "https://example.com/missing.png", "alt": None},
+        ]
+    }
+
+    filenames = download_post_images(post, str(tmp_path / "blog"))
+    for _ in ["mastodon", "x", "bluesky"]:
+        paths = download_images_for_post(post, str(tmp_path / "social"))
+        assert [os.path.basename(p) for p in paths] == filenames
+
+    assert download.call_count == 2
+    assert mock_http.call_count == 2
+    artifact = get_image_artifact("https://example.com/a.png", str(tmp_path))
+    assert artifact.read() == b"a bytes"
+    assert (tmp_path / "social" / artifact.filename).read_bytes() == b"a bytes"
+
+
+def test_image_artifacts_shared_across_concurrent_consumers(tmp_path, monkeypatch):
+    """Test that platforms fetching the same post at once download it once"""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from scripts import update_links
+    from scripts.update_links import get_post_image_artifacts
+
+    downloads = []
+    lock = threading.Lock()
+
+    def download(url, dest):
+        with lock:
+            downloads.append(url)
+        time.sleep(0.05)
+        filename = url.rsplit("/", 1)[1]
+        store = os.path.join(update_links.CACHE_DIR, update_links.IMAGE_STORE_DIR)
+        for directory in [store, dest]:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, filename), "wb") as f:
+                f.write(b"image")
+        return filename
+
+    monkeypatch.setattr(update_links, "download_image", download)
+    post = {
+        "images": [
+            {"src": f"https://example.com/{i}.png", "alt": None} for i in range(3)
+        ]
+    }
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(
+            executor.map(
+                lambda _: get_post_image_artifacts(post, str(tmp_path)), range(3)
+            )
+        )
+
+    assert sorted(downloads) == [f"https://example.com/{i}.png" for i in range(3)]
+    assert all(
+        [a.filename for a in artifacts] == ["0.png", "1.png", "2.png"]
+        for artifacts in results
+    )
+
+
+def test_post_image_artifacts_parallel_and_ordered(tmp_path, monkeypatch):
+    """Test that images download concurrently but come back in post order"""
+    import threading
+    import time
+
+    from scripts import update_links
+    from scripts.update_links import get_post_image_artifacts
+
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def download(url, dest):
+        index = int(url.rsplit("/", 1)[1])
+        with lock:
+            in_flight.append(url)
+            peak.append(len(in_flight))
+        # Later images finish first
+        time.sleep(0.01 * (6 - index))
+        with lock:
+            in_flight.remove(url)
+        return None if index == 2 else f"{index}.png"
+
+    monkeypatch.setattr(update_links, "download_image", download)
+    post = {
+        "images": [
+            {"src": f"https://host-{i % 3}.com/{i}", "alt": None} for i in range(6)
+        ]
+    }
+
+    artifacts = get_post_image_artifacts(post, str(tmp_path))
+
+    assert [a.filename if a else None for a in artifacts] == [
+        "0.png",
+        "1.png",
+        None,
+        "3.png",
+        "4.png",
+        "5.png",
+    ]
+    assert max(peak) > 1
+    assert max(peak) <= update_links.IMAGE_DOWNLOAD_WORKERS
+
+
+def test_image_artifact_spills_past_memory_budget(tmp_path, monkeypatch):
+    """Test that bytes past the memory budget are re-read from disk"""
+    from scripts import update_links
+    from scripts.update_links import ImageArtifact
+
+    monkeypatch.setattr(update_links, "IMAGE_ARTIFACT_MEMORY_BUDGET", 10)
+    small, large = tmp_path / "small.png", tmp_path / "large.png"
+    small.write_bytes(b"12345678")
+    large.write_bytes(b"123456789")
+
+    small_artifact = ImageArtifact("https://example.com/s", str(small))
+    large_artifact = ImageArtifact("https://example.com/l", str(large))
+    assert small_artifact.read() == b"12345678"
+    assert large_artifact.read() == b"123456789"
+
+    small.write_bytes(b"changed")
+    large.write_bytes(b"changed")
+    assert small_artifact.read() == b"12345678"
+    assert large_artifact.read() == b"changed"
+
+
+def save_test_png(path, size):
+    """Write a flat-colored PNG, which recompresses well like a screenshot"""
+    from PIL import Image
+
+    Image.new("RGB", size, (240, 240, 240)).save(path, format="PNG", compress_level=0)
+
+
+def test_optimize_post_images(tmp_path, monkeypatch):
+    """Test that images are capped, recompressed and given narrower variants"""
+    from PIL import Image
+
+    from scripts import update_links
+    from scripts.update_links import optimize_post_images
+
+    monkeypatch.setattr(update_links, "IMAGE_MAX_DIMENSION", 1200)
+    monkeypatch.setattr(update_links, "IMAGE_VARIANT_WIDTHS", (300, 600, 2000))
+    post_dir = tmp_path / "post"
+    post_dir.mkdir()
+    save_test_png(post_dir / "original.png", (1600, 800))
+
+    result = optimize_post_images(["original.png"], str(post_dir))
+
+    variants = result["original.png"]
+    assert [(v["width"], v["height"]) for v in variants] == [
+        (1200, 600),
+        (600, 300),
+        (300, 150),
+    ]
+    assert not (post_dir / "original.png").exists()
+    for variant in variants:
+        path = post_dir / f"{variant['sha256']}{variant['ext']}"
+        assert path.stat().st_size == variant["size"]
+        with Image.open(path) as img:
+            assert img.size == (variant["width"], variant["height"])
+
+
+def test_optimize_post_images_runs_once_per_hash(tmp_path, monkeypatch):
+    """Test that an already-optimized image is only linked into place"""
+    from scripts import update_links
+    from scripts.update_links import optimize_post_images
+
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    save_test_png(first / "original.png", (600, 300))
+    shutil.copy(first / "original.png", second / "original.png")
+    expected = optimize_post_images(["original.png"], str(first))
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("image was optimized again")
+
+    monkeypatch.setattr(update_links, "ProcessPoolExecutor", no_pool)
+    result = optimize_post_images(["original.png"], str(second))
+
+    assert [v["sha256"] for v in result["original.png"]] == [
+        v["sha256"] for v in expected["original.png"]
+    ]
+    assert sorted(os.listdir(second)) == sorted(os.listdir(first))
+
+
+def test_optimize_post_images_keeps_original_when_smaller(tmp_path):
+    """Test that recompression never makes an image bigger"""
+    from PIL import Image
+
+    from scripts.update_links import optimize_post_images
+
+    post_dir = tmp_path / "post"
+    post_dir.mkdir()
+    Image.new("RGB", (100, 100), (255, 0, 0)).save(post_dir / "tiny.png", optimize=True)
+    size = (post_dir / "tiny.png").stat().st_size
+
+    variants = optimize_post_images(["tiny.png"], str(post_dir))["tiny.png"]
+
+    assert len(variants) == 1
+    assert variants[0]["size"] <= size
+
+
+def test_generate_markdown_content_inline_with_variants():
+    """Test that optimized images list their width and variants"""
+    from scripts.update_links import generate_markdown_content_inline
+
+    post = {
+        "date": "2025-01-01",
+        "images": [{"src": "https://example.com/a.png", "alt": "A chart"}],
+    }
+    variants = [
+        {"sha256": "full", "ext": ".webp", "width": 1200, "height": 600},
+        {"sha256": "small", "ext": ".webp", "width": 480, "height": 240},
+    ]
+
+    content = generate_markdown_content_inline(
+        post,
+        "Body",
+        {"https://example.com/a.png": "full.webp"},
+        {"full.webp": variants},
+    )
+
+    assert content == "\n".join(
+        [
+            "---",
+            "date: 2025-01-01",
+            "images:",
+            "  - full.webp",
+            "resources:",
+            "  - src: full.webp",
+            "    params:",
+            '      alt: "A chart"',
+            "      width: 1200",
+            "      height: 600",
+            "      variants:",
+            "        - src: small.webp",
+            "          width: 480",
+            "---",
+            "",
+            "Body",
+        ]
+    )
+
+
+def noisy_png(size):
+    """PNG bytes of random noise, which compresses poorly"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(
+        buffer, format="PNG"
+    )
+    return buffer.getvalue()
+
+
+def test_fit_image_leaves_fitting_images_alone():
+    """Test that an image within the limits is returned byte for byte"""
+    from scripts.update_links import fit_image
+
+    data = noisy_png((50, 40))
+
+    assert fit_image(data, len(data), 50) == (data, ".png")
+
+
+def test_fit_image_shrinks_to_limits():
+    """Test that oversized images are scaled and recompressed until they fit"""
+    from PIL import Image
+
+    from scripts.update_links import fit_image
+
+    data = noisy_png((1200, 600))
+
+    fitted, ext = fit_image(data, 100_000, 1000)
+
+    assert ext == ".jpg"
+    assert len(fitted) <= 100_000
+    with Image.open(io.BytesIO(fitted)) as img:
+        assert max(img.size) <= 1000
+        assert img.width / img.height == pytest.approx(2, rel=0.01)
+
+
+def test_fit_image_keeps_png_when_it_fits():
+    """Test that screenshots stay lossless when downsizing alone is enough"""
+    from PIL import Image
+
+    from scripts.update_links import fit_image
+
+    buffer = io.BytesIO()
+    Image.new("RGBA", (3000, 1000), (0, 0, 0, 0)).save(buffer, format="PNG")
+
+    fitted, ext = fit_image(buffer.getvalue(), 1_000_000, 1500)
+
+    assert ext == ".png"
+    with Image.open(io.BytesIO(fitted)) as img:
+        assert img.size == (1500, 500)
+
+
+def test_prepare_image_for_platform_caches_by_hash(tmp_path, monkeypatch):
+    """Test that each image is fitted once per platform"""
+    from scripts import update_links
+    from scripts.update_links import ImageArtifact, prepare_image_for_platform
+
+    data = noisy_png((400, 200))
+    store = tmp_path / "cache" / "images"
+    store.mkdir(parents=True)
+    filename = hashlib.sha256(data).hexdigest() + ".png"
+    (store / filename).write_bytes(data)
+    artifact = ImageArtifact("https://example.com/a.png", str(store / filename))
+    monkeypatch.setitem(
+        update_links.PLATFORM_IMAGE_LIMITS,
+        "bluesky",
+        {"max_bytes": 50_000, "max_dimension": 2000},
+    )
+
+    bluesky_name, bluesky_data = prepare_image_for_platform(artifact, "bluesky")
+    mastodon_name, mastodon_data = prepare_image_for_platform(artifact, "mastodon")
+
+    assert len(bluesky_data) <= 50_000
+    assert bluesky_name == hashlib.sha256(bluesky_data).hexdigest() + ".jpg"
+    assert (mastodon_name, mastodon_data) == (filename, data)
+
+    fit = MagicMock(side_effect=AssertionError("image was fitted again"))
+    monkeypatch.setattr(update_links, "fit_image", fit)
+    update_links.reset_caches()
+    assert prepare_image_for_platform(artifact, "bluesky") == (
+        bluesky_name,
+        bluesky_data,
+    )
+    assert prepare_image_for_platform(artifact, "mastodon") == (filename, data)
+
+
+def test_describe_image_reads_each_image_once(tmp_path, monkeypatch):
+    """Test that image details are recorded and then served from the manifest"""
+    from scripts import update_links
+    from scripts.update_links import describe_image
+
+    data = noisy_png((30, 20))
+    path = tmp_path / (hashlib.sha256(data).hexdigest() + ".png")
+    path.write_bytes(data)
+
+    expected = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "width": 30,
+        "height": 20,
+        "bytes": len(data),
+        "mime": "image/png",
+    }
+    assert describe_image(str(path)) == expected
+
+    monkeypatch.setattr(update_links.Image, "open", MagicMock(side_effect=OSError))
+    update_links.reset_caches()
+    assert describe_image(str(path)) == expected
+    assert describe_image(str(tmp_path / "unknown.png")) is None
+
+
+def test_generate_markdown_content_includes_manifest_dimensions(tmp_path):
+    """Test that frontmatter records dimensions of images in the manifest"""
+    from scripts.update_links import generate_markdown_content, record_image_manifest
+
+    record_image_manifest("abc", 959, 931, 1000, "image/png")
+    post = {
+        "date": "2025-01-01",
+        "text": "Hello",
+        "images": [{"src": "https://example.com/a.png", "alt": None}],
+    }
+
+    content = generate_markdown_content(post, ["abc.png"])
+
+    assert (
+        "\n".join(
+            [
+                "resources:",
+                "  - src: abc.png",
+                "    params:",
+                "      width: 959",
+                "      height: 931",
+            ]
+        )
+        in content
+    )
+
+
+def test_process_issue_text_captures_img_dimensions():
+    """Test that width and height are kept from GitHub's <img> tags"""
+    from scripts.update_links import process_issue_text
+
+    text = (
+        '<img width="959" height="931" alt="Image" '
+        'src="https://github.com/user-attachments/assets/a" />\n\n'
+        '<img alt="No size" src="https://github.com/user-attachments/assets/b" />\n\n'
+        '<img width="50%" height="931" alt="Scaled" '
+        'src="https://github.com/user-attachments/assets/c" />\n\n'
+        "<img width=640 height=480 alt=Bare "
+        'src="https://github.com/user-attachments/assets/d">'
+    )
+
+    _, images = process_issue_text(text)
+
+    assert images == [
+        {
+            "src": "https://github.com/user-attachments/assets/a",
+            "alt": "Image",
+            "width": 959,
+            "height": 931,
+        },
+        {"src": "https://github.com/user-attachments/assets/b", "alt": "No size"},
+        {"src": "https://github.com/user-attachments/assets/c", "alt": "Scaled"},
+        {
+            "src": "https://github.com/user-attachments/assets/d",
+            "alt": None,
+            "width": 640,
+            "height": 480,
+        },
+    ]
+
+
+def test_save_post_keeps_img_dimensions_out_of_manifest(tmp_path, monkeypatch):
+    """Test that tagged sizes reach frontmatter but the manifest has real sizes"""
+    from scripts import update_links
+    from scripts.update_links import image_manifest, save_post
+
+    sized, unsized = noisy_png((40, 30)), noisy_png((20, 10))
+    files = {
+        "https://example.com/sized": sized,
+        "https://example.com/unsized": unsized,
+    }
+
+    def download(url, dest):
+        filename = hashlib.sha256(files[url]).hexdigest() + ".png"
+        os.makedirs(dest, exist_ok=True)
+        with open(os.path.join(dest, filename), "wb") as f:
+            f.write(files[url])
+        return filename
+
+    monkeypatch.setattr(update_links, "download_image", download)
+    monkeypatch.chdir(tmp_path)
+    post = {
+        "date": "2025-01-01T00:00:00Z",
+        "text": "Hello",
+        "images": [
+            {
+                "src": "https://example.com/sized",
+                "alt": "Sized",
+                "width": 959,
+                "height": 931,
+            },
+            {"src": "https://example.com/unsized", "alt": None},
+        ],
+        "hash": "1",
+        "title": "Hello",
+        "url": None,
+    }
+
+    post_dir = save_post(post)
+
+    with open(os.path.join(post_dir, "index.md")) as f:
+        content = f.read()
+    assert "      width: 959\n      height: 931" in content
+    assert "      width: 20\n      height: 10" in content
+    assert image_manifest.get(hashlib.sha256(sized).hexdigest()) == {
+        "sha256": hashlib.sha256(sized).hexdigest(),
+        "width": 40,
+        "height": 30,
+        "bytes": len(sized),
+        "mime": "image/png",
+    }
+
+
+def test_image_placeholder_cached_per_hash(tmp_path, monkeypatch):
+    """Test that placeholders are tiny data URIs made once per content hash"""
+    from PIL import Image
+    from scripts import update_links
+    from scripts.update_links import image_placeholder, image_placeholders
+
+    data = noisy_png((400, 300))
+    path = tmp_path / (hashlib.sha256(data).hexdigest() + ".png")
+    path.write_bytes(data)
+
+    placeholder = image_placeholder(str(path))
+
+    assert placeholder.startswith("data:image/webp;base64,")
+    assert len(placeholder) < 1000
+    with Image.open(io.BytesIO(base64.b64decode(placeholder.split(",")[1]))) as img:
+        assert max(img.size) <= update_links.PLACEHOLDER_MAX_DIMENSION
+    assert image_placeholders.get(path.stem) == placeholder
+
+    # A cached hash isn't decoded again
+    monkeypatch.setattr(update_links.Image, "open", None)
+    assert image_placeholder(str(path)) == placeholder
+
+
+def test_save_post_writes_placeholders(tmp_path, monkeypatch):
+    """Test that saved images get a placeholder in their frontmatter"""
+    from scripts import update_links
+    from scripts.update_links import image_placeholders, save_post
+
+    data = noisy_png((40, 30))
+    filename = hashlib.sha256(data).hexdigest() + ".png"
+
+    def download(url, dest):
+        os.makedirs(dest, exist_ok=True)
+        with open(os.path.join(dest, filename), "wb") as f:
+            f.write(data)
+        return filename
+
+    monkeypatch.setattr(update_links, "download_image", download)
+    monkeypatch.chdir(tmp_path)
+    post = {
+        "date": "2025-01-01T00:00:00Z",
+        "text": "Hello",
+        "images": [{"src": "https://example.com/a", "alt": "A"}],
+        "hash": "1",
+        "title": "Hello",
+        "url": None,
+    }
+
+    post_dir = save_post(post)
+
+    with open(os.path.join(post_dir, "index.md")) as f:
+        content = f.read()
+    placeholder = image_placeholders.get(filename.split(".")[0])
+    assert f'      placeholder: "{placeholder}"' in content
+
+
+def test_social_posting_keeps_optimized_blog_images(tmp_path, monkeypatch, mock_http):
+    """Test that posting doesn't restore an image the blog post replaced"""
+    import io
+
+    from PIL import Image
+
+    from scripts import update_links
+    from scripts.update_links import post_to_social_media, save_post
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 800), (240, 240, 240)).save(
+        buffer, format="PNG", compress_level=0
+    )
+    data = buffer.getvalue()
+    mock_http.add("https://example.com/big.png", content=data)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MASTODON_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(update_links, "refresh_fingerprints", lambda *a: None)
+    monkeypatch.setattr(update_links, "POST_MIN_INTERVAL", 0)
+    monkeypatch.setattr(update_links, "upload_media_to_mastodon", lambda *a: "media")
+
+    def http_request(method, url, **kwargs):
+        response = MagicMock(status_code=200, headers={})
+        response.json.return_value = {"id": "1"}
+        return response
+
+    monkeypatch.setattr(update_links, "http_request", http_request)
+    post = {
+        "date": "2025-01-01T00:00:00Z",
+        "text": "Hello",
+        "images": [{"src": "https://example.com/big.png", "alt": "Big"}],
+        "hash": "1",
+        "title": "Hello",
+        "url": None,
+    }
+
+    post_dir = save_post(post, optimize_images=True)
+    saved = sorted(os.listdir(post_dir))
+    outcomes = post_to_social_media([post], ["mastodon"])
+
+    assert outcomes[0]["status"] == "posted"
+    assert sorted(os.listdir(post_dir)) == saved
+    original = hashlib.sha256(data).hexdigest() + ".png"
+    assert original not in saved
+
+
+def test_cached_upload_reuses_until_expiry(monkeypatch):
+    """Test that uploads are reused per (hash, platform, alt) until they expire"""
+    from scripts import update_links
+    from scripts.update_links import cached_upload
+
+    now = [1000.0]
+    monkeypatch.setattr(update_links.time, "time", lambda: now[0])
+    upload = MagicMock(side_effect=["media-1", "media-2", "media-3"])
+
+    assert cached_upload("x", "abc", "Alt", upload) == "media-1"
+    assert cached_upload("x", "abc", "Alt", upload) == "media-1"
+    assert cached_upload("x", "abc", "Other alt", upload) == "media-2"
+    assert upload.call_count == 2
+
+    now[0] += update_links.UPLOAD_REUSE_TTL["x"][0] + 1
+    assert cached_upload("x", "abc", "Alt", upload) == "media-3"
+
+
+def test_mark_uploads_attached_follows_platform_rules(monkeypatch):
+    """Test that attached Mastodon media is dropped and Bluesky blobs kept"""
+    from scripts import update_links
+    from scripts.update_links import cached_upload, mark_uploads_attached
+
+    now = [1000.0]
+    monkeypatch.setattr(update_links.time, "time", lambda: now[0])
+    cached_upload("mastodon", "abc", "Alt", lambda: "media-1")
+    cached_upload("bluesky", "abc", None, lambda: {"ref": {"$link": "cid"}})
+
+    mark_uploads_attached("mastodon", [("abc", "Alt")])
+    mark_uploads_attached("bluesky", [("abc", None)])
+
+    now[0] += 365 * 24 * 60 * 60
+    assert cached_upload("mastodon", "abc", "Alt", lambda: "media-2") == "media-2"
+    assert cached_upload("bluesky", "abc", None, lambda: None) == {
+        "ref": {"$link": "cid"}
+    }
+
+
+def test_post_to_bluesky_reuses_uploaded_blobs(tmp_path, monkeypatch):
+    """Test that re-posting an image reuses its blob instead of uploading"""
+    from atproto import models
+
+    from scripts import update_links
+    from scripts.update_links import post_to_bluesky
+
+    data = noisy_png((40, 30))
+    filename = hashlib.sha256(data).hexdigest() + ".png"
+
+    def download(url, dest=None):
+        store = os.path.join(update_links.CACHE_DIR, update_links.IMAGE_STORE_DIR)
+        os.makedirs(store, exist_ok=True)
+        with open(os.path.join(store, filename), "wb") as f:
+            f.write(data)
+        return filename
+
+    monkeypatch.setattr(update_links, "download_image", download)
+    monkeypatch.setenv("BLUESKY_APP_PASSWORD", "password")
+    monkeypatch.setattr(update_links, "refresh_fingerprints", lambda *a: None)
+    client = MagicMock()
+    client.send_post.return_value = MagicMock(uri="at://post/1", cid="cid1")
+    client.upload_blob.return_value.blob = models.blob_ref.BlobRef(
+        mime_type="image/png", size=len(data), ref={"$link": "bafkrei"}
+    )
+    monkeypatch.setattr(update_links, "Client", lambda **kwargs: client)
+    monkeypatch.setattr(update_links, "POST_MIN_INTERVAL", 0)
+    post = {
+        "text": "Hello",
+        "images": [{"src": "https://example.com/a.png", "alt": "A"}],
+    }
+
+    post_to_bluesky([post])
+    update_links.reset_image_artifacts()
+    outcome = post_to_bluesky([{**post, "text": "Hello again"}])
+
+    assert outcome["status"] == "posted"
+
+    assert client.upload_blob.call_count == 1
+    assert client.send_post.call_count == 2
+    embed = client.send_post.call_args.kwargs["embed"]
+    assert embed["images"][0]["image"].ref.link == "bafkrei"
+    assert embed["images"][0]["aspectRatio"] == {"width": 40, "height": 30}
+
+
+def test_post_to_social_media_publishes_platforms_concurrently(monkeypatch, capsys):
+    """Test that platforms post side by side and report their outcomes"""
+    import time
+
+    from scripts import update_links
+    from scripts.update_links import post_to_social_media, publish_outcome
+
+    def slow_post(platform):
+        def post(posts):
+            time.sleep(0.2)
+            return publish_outcome(platform, "posted", len(posts))
+
+        return post
+
+    def broken_post(posts):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(update_links, "post_to_mastodon", slow_post("mastodon"))
+    monkeypatch.setattr(update_links, "post_to_x", slow_post("x"))
+    monkeypatch.setattr(update_links, "post_to_bluesky", broken_post)
+    posts = [{"date": "2025-01-01T00:00:00Z", "text": "Hello", "images": None}]
+
+    start = time.monotonic()
+    outcomes = post_to_social_media(posts, ["bluesky", "x", "mastodon"])
+
+    assert time.monotonic() - start < 0.35
+    assert [(o["platform"], o["status"], o["posts"]) for o in outcomes] == [
+        ("mastodon", "posted", 1),
+        ("x", "posted", 1),
+        ("bluesky", "failed", 0),
+    ]
+    assert outcomes[2]["detail"] == "boom"
+    assert "bluesky: failed, 0 post(s)" in capsys.readouterr().out
+
+
+def test_post_to_mastodon_reports_partial_failure(monkeypatch):
+    """Test that a failed thread still reports the parts that were posted"""
+    from scripts import update_links
+    from scripts.update_links import post_to_mastodon
+
+    monkeypatch.setenv("MASTODON_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(update_links, "refresh_fingerprints", lambda *a: None)
+    monkeypatch.setattr(update_links.time, "sleep", lambda seconds: None)
+    responses = [MagicMock(), MagicMock()]
+    responses[0].json.return_value = {"id": "1"}
+    responses[1].raise_for_status.side_effect = RuntimeError("422 Unprocessable")
+    monkeypatch.setattr(update_links, "http_request", lambda *a, **kw: responses.pop(0))
+    posts = [
+        {"date": "2025-01-01T00:00:00Z", "text": "One", "images": None},
+        {"date": "2025-01-01T00:00:00Z", "text": "Two", "images": None},
+    ]
+
+    outcome = post_to_mastodon(posts)
+
+    assert outcome["status"] == "failed"
+    assert outcome["posts"] == 1
+    assert outcome["detail"] == "422 Unprocessable"
+
+
+def test_parse_rate_limit_reset():
+    """Test that epoch seconds and Mastodon's ISO timestamps both parse"""
+    from scripts.update_links import parse_rate_limit_reset
+
+    assert parse_rate_limit_reset("1735689900") == 1735689900
+    assert parse_rate_limit_reset("2025-01-01T00:05:00.123Z") == 1735689900
+    assert parse_rate_limit_reset("soon") is None
+
+
+def test_rate_limiter_keeps_min_interval(monkeypatch):
+    """Test that posts are only spaced by the floor while tokens remain"""
+    from scripts import update_links
+    from scripts.update_links import RateLimiter
+
+    waits = []
+    monkeypatch.setattr(update_links.time, "sleep", waits.append)
+    limiter = RateLimiter("mastodon", 300, 300)
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.observe({"X-RateLimit-Remaining": "250"})
+    limiter.acquire()
+
+    assert len(waits) == 2
+    assert all(0 < wait <= update_links.POST_MIN_INTERVAL for wait in waits)
+
+
+def test_rate_limiter_waits_for_tokens_and_defers_exhausted_window(monkeypatch):
+    """Test that headers slow posting down, and a closed window defers it"""
+    import time
+
+    from scripts import update_links
+    from scripts.update_links import RateLimitDeferred, RateLimiter
+
+    waits = []
+    monkeypatch.setattr(update_links.time, "sleep", waits.append)
+    monkeypatch.setattr(update_links, "POST_MIN_INTERVAL", 0)
+    limiter = RateLimiter("x", 100, 100)
+
+    limiter.observe({"x-rate-limit-remaining": "0"})
+    limiter.acquire()
+    assert waits and 0.9 < waits[0] <= 1
+
+    limiter.observe(
+        {
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": str(int(time.time()) + 600),
+        }
+    )
+    with pytest.raises(RateLimitDeferred) as deferred:
+        limiter.acquire()
+    assert deferred.value.retry_at > time.time() + 500
+    assert len(waits) == 1
+
+
+def test_rate_limiters_only_observe_post_endpoints(monkeypatch):
+    """Test that a drained read endpoint window doesn't defer posting"""
+    import time
+
+    from scripts import update_links
+    from scripts.update_links import (
+        RateLimitDeferred,
+        get_rate_limiter,
+        make_x_clients,
+        observe_post_response,
+    )
+
+    monkeypatch.setattr(update_links, "POST_MIN_INTERVAL", 0)
+    for name in [
+        "CONSUMER_KEY",
+        "CONSUMER_SECRET",
+        "ACCESS_TOKEN",
+        "ACCESS_TOKEN_SECRET",
+    ]:
+        monkeypatch.setenv(f"X_{name}", "secret")
+    drained = {
+        "x-rate-limit-remaining": "0",
+        "x-rate-limit-reset": str(int(time.time()) + 600),
+    }
+    client, _ = make_x_clients()
+    hook = client.session.hooks["response"][-1]
+
+    def response(method, url):
+        return MagicMock(request=MagicMock(method=method), url=url, headers=drained)
+
+    hook(response("GET", "https://api.twitter.com/2/users/me"))
+    observe_post_response(
+        "bluesky",
+        "GET",
+        "https://bsky.social/xrpc/app.bsky.feed.getAuthorFeed?actor=me",
+        {"ratelimit-remaining": "0", "ratelimit-reset": drained["x-rate-limit-reset"]},
+    )
+    get_rate_limiter("x").acquire()
+    get_rate_limiter("bluesky").acquire()
+
+    hook(response("POST", "https://api.twitter.com/2/tweets"))
+    with pytest.raises(RateLimitDeferred):
+        get_rate_limiter("x").acquire()
+
+
+def test_post_to_social_media_reports_deferred_platform(monkeypatch):
+    """Test that a thread cut short by a rate limit is reported as deferred"""
+    from scripts import update_links
+    from scripts.update_links import get_rate_limiter, post_to_social_media
+
+    monkeypatch.setenv("MASTODON_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(update_links, "refresh_fingerprints", lambda *a: None)
+    monkeypatch.setattr(update_links.time, "sleep", lambda seconds: None)
+    limited = MagicMock(status_code=429, headers={"X-RateLimit-Remaining": "0"})
+    limited.headers["X-RateLimit-Reset"] = "2999-01-01T00:00:00.000Z"
+    responses = [MagicMock(status_code=200, headers={}), limited]
+    responses[0].json.return_value = {"id": "1"}
+    monkeypatch.setattr(update_links, "http_request", lambda *a, **kw: responses.pop(0))
+    posts = [
+        {"date": "2025-01-01T00:00:00Z", "text": "One", "images": None},
+        {"date": "2025-01-01T00:00:00Z", "text": "Two", "images": None},
+    ]
+
+    [outcome] = post_to_social_media(posts, ["mastodon"])
+
+    assert outcome["status"] == "deferred"
+    assert outcome["posts"] == 1
+    assert get_rate_limiter("mastodon").blocked_until > 0
+
+
+def test_post_to_mastodon_defers_429_without_reset_header(monkeypatch):
+    """Test that a bare 429 defers even with no minimum interval to wait"""
+    from scripts import update_links
+    from scripts.update_links import post_to_mastodon
+
+    monkeypatch.setenv("MASTODON_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(update_links, "refresh_fingerprints", lambda *a: None)
+    monkeypatch.setattr(update_links, "POST_MIN_INTERVAL", 0)
+    limited = MagicMock(status_code=429, headers={})
+    monkeypatch.setattr(update_links, "http_request", lambda *a, **kw: limited)
+    posts = [{"date": "2025-01-01T00:00:00Z", "text": "One", "images": None}]
+
+    outcome = post_to_mastodon(posts)
+
+    assert outcome["status"] == "deferred"
+    assert outcome["posts"] == 0
+    limited.raise_for_status.assert_not_called()
+
+
+def test_publish_journal_survives_reload_and_torn_lines():
+    """Test that journaled posts are read back, ignoring a cut-off line"""
+    from scripts.update_links import publish_journal
+
+    publish_journal.record("7", "bluesky", 0, 0, "at://post/1", "cid1")
+    publish_journal.record("7", "bluesky", 1, 0, "at://post/2", "cid2")
+    with open(publish_journal.path, "a") as f:
+        f.write('{"issue": "7", "platf')
+    publish_journal.reset()
+
+    assert publish_journal.get("7", "bluesky", 1, 0)["post_id"] == "at://post/2"
+    assert publish_journal.get("7", "bluesky", 2, 0) is None
+    assert publish_journal.has_published("7", "bluesky")
+    assert not publish_journal.has_published("7", "x")
+    assert not publish_journal.has_published("8", "bluesky")
+
+
+def test_post_to_mastodon_resumes_from_journal(monkeypatch):
+    """Test that a rerun replies to the last journaled part and carries on"""
+    from scripts import update_links
+    from scripts.update_links import post_to_mastodon, publish_journal
+
+    monkeypatch.setenv("MASTODON_ACCESS_TOKEN", "token")
+    refresh = MagicMock()
+    monkeypatch.setattr(update_links, "refresh_fingerprints", refresh)
+    monkeypatch.setattr(update_links, "POST_MIN_INTERVAL", 0)
+    requests_made = []
+
+    def http_request(method, url, **kwargs):
+        requests_made.append(kwargs["data"])
+        response = MagicMock(status_code=200, headers={})
+        response.json.return_value = {"id": "101"}
+        return response
+
+    monkeypatch.setattr(update_links, "http_request", http_request)
+    publish_journal.record("7", "mastodon", 0, 0, "100")
+    posts = [
+        {"date": "2025-01-01T00:00:00Z", "text": "One", "images": None, "hash": "7"},
+        {"date": "2025-01-01T00:00:00Z", "text": "Two", "images": None, "hash": "7"},
+    ]
+
+    outcome = post_to_mastodon(posts)
+
+    assert outcome["status"] == "posted"
+    assert outcome["posts"] == 1
+    assert requests_made == [{"status": "Two", "in_reply_to_id": "100"}]
+    assert publish_journal.get("7", "mastodon", 1, 0)["post_id"] == "101"
+    refresh.assert_not_called()
+
+    assert post_to_mastodon(posts)["status"] == "skipped"
+    assert len(requests_made) == 1
+
+
+def test_post_to_bluesky_resumes_thread_under_journaled_root(monkeypatch):
+    """Test that resumed Bluesky replies keep the original thread root"""
+    from scripts import update_links
+    from scripts.update_links import post_to_bluesky, publish_journal
+
+    monkeypatch.setenv("BLUESKY_APP_PASSWORD", "password")
+    refresh = MagicMock()
+    monkeypatch.setattr(update_links, "refresh_fingerprints", refresh)
+    client = MagicMock()
+    client.send_post.return_value = MagicMock(uri="at://post/3", cid="cid3")
+    monkeypatch.setattr(update_links, "Client", lambda **kwargs: client)
+    publish_journal.record("7", "bluesky", 0, 0, "at://post/1", "cid1")
+    publish_journal.record("7", "bluesky", 1, 0, "at://post/2", "cid2")
+    posts = [
+        {"date": "2025-01-01T00:00:00Z", "text": text, "images": None, "hash": "7"}
+        for text in ["One", "Two", "Three"]
+    ]
+
+    outcome = post_to_bluesky(posts)
+
+    assert outcome["posts"] == 1
+    assert client.send_post.call_args.kwargs["reply_to"] == {
+        "root": {"uri": "at://post/1", "cid": "cid1"},
+        "parent": {"uri": "at://post/2", "cid": "cid2"},
+    }
+    assert publish_journal.get("7", "bluesky", 2, 0)["cid"] == "cid3"
+    refresh.assert_not_called()
+
+
+def test_text_fingerprint_ignores_link_rewriting():
+    """Test that a post's SimHash survives platforms rewriting its links"""
+    from scripts.update_links import text_fingerprint
+
+    text = (
+        "A thoughtful piece on how newsrooms build interactive graphics "
+        "https://example.com/story?utm_source=x"
+    )
+    simhash, urls = text_fingerprint(text)
+
+    assert urls == ["https://example.com/story"]
+    without_link = text.split(" https://")[0]
+    assert text_fingerprint(text.replace("?utm_source=x", ""))[0] == simhash
+    assert text_fingerprint(without_link)[0] == simhash
+    other, _ = text_fingerprint("Completely unrelated words about cooking pasta")
+    assert (simhash ^ other).bit_count() > 10
+    assert text_fingerprint("https://example.com/") == (
+        None,
+        ["https://example.com/"],
+    )
+
+
+def test_find_similar_post_uses_threshold_and_platform():
+    """Test that near-identical posts match only within the threshold"""
+    from scripts.update_links import (
+        find_similar_post,
+        record_fingerprint,
+        text_fingerprint,
+    )
+
+    text = (
+        "A long explainer on why our election results maps load so quickly, "
+        "and the caching tricks behind them"
+    )
+    record_fingerprint("mastodon", "1", text)
+    record_fingerprint("x", "2", "https://example.com/only-a-link")
+    edited = text + " today"
+    distance = (text_fingerprint(text)[0] ^ text_fingerprint(edited)[0]).bit_count()
+
+    assert find_similar_post(text, "mastodon")["post_id"] == "1"
+    assert find_similar_post(text, "bluesky") is None
+    assert find_similar_post(edited, "mastodon", max_distance=distance)
+    assert find_similar_post(edited, "mastodon", max_distance=distance - 1) is None
+    assert find_similar_post("https://example.com/only-a-link", "x")["post_id"] == ("2")
+
+
+def test_find_similar_post_requires_shared_url():
+    """Test that the same words about different links aren't duplicates"""
+    from scripts.update_links import find_similar_post, record_fingerprint
+
+    record_fingerprint(
+        "mastodon", "1", "Worth reading: https://www.nytimes.com/2025/01/01/a.html"
+    )
+
+    assert (
+        find_similar_post(
+            "Worth reading: https://www.washingtonpost.com/2025/01/02/b/", "mastodon"
+        )
+        is None
+    )
+    assert find_similar_post(
+        "Worth reading! https://www.nytimes.com/2025/01/01/a.html", "mastodon"
+    )
+
+
+def test_refresh_fingerprints_only_when_stale(monkeypatch):
+    """Test that timelines are read incrementally, and only once stale"""
+    from scripts import update_links
+    from scripts.update_links import find_similar_post, refresh_fingerprints
+
+    now = [1000000.0]
+    monkeypatch.setattr(update_links.time, "time", lambda: now[0])
+    fetch = MagicMock(return_value=[("11", "Posted by hand, not by the script")])
+
+    refresh_fingerprints("mastodon", fetch)
+    refresh_fingerprints("mastodon", fetch)
+    now[0] += update_links.FINGERPRINT_REFRESH_INTERVAL
+    fetch.return_value = []
+    refresh_fingerprints("mastodon", fetch)
+
+    assert [c.args for c in fetch.call_args_list] == [(None,), ("11",)]
+    assert find_similar_post("Posted by hand, not by the script", "mastodon")
+
+
+def test_mastodon_status_text_expands_links():
+    """Test that Mastodon's shortened link text is replaced by the href"""
+    from scripts.update_links import mastodon_status_text
+
+    content = (
+        '<p>Great read &amp; more <a href="https://example.com/a/long/path?x=1&amp;y=2"'
+        ' rel="nofollow"><span class="invisible">https://</span>'
+        '<span class="ellipsis">example.com/a/long</span></a> '
+        '<a href="https://mastodon.social/tags/maps" class="mention hashtag">'
+        "#<span>maps</span></a></p>"
+    )
+
+    assert mastodon_status_text(content) == (
+        "Great read & more  https://example.com/a/long/path?x=1&y=2  #maps"
+    )
+
+
+def test_post_to_mastodon_skips_fingerprinted_post(monkeypatch):
+    """Test that a posted thread is recognized locally the next time"""
+    from scripts import update_links
+    from scripts.update_links import fingerprint_index, post_to_mastodon
+
+    monkeypatch.setenv("MASTODON_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(update_links, "refresh_fingerprints", lambda *a: None)
+    response = MagicMock(status_code=200, headers={})
+    response.json.return_value = {"id": "55"}
+    request = MagicMock(return_value=response)
+    monkeypatch.setattr(update_links, "http_request", request)
+    posts = [{"date": "2025-01-01T00:00:00Z", "text": "Hello world", "images": None}]
+
+    assert post_to_mastodon(posts)["status"] == "posted"
+    assert fingerprint_index.get("mastodon/55")["post_id"] == "55"
+    assert post_to_mastodon(posts)["status"] == "skipped"
+    assert request.call_count == 1
+
+
+def test_get_bluesky_client_resumes_saved_session(monkeypatch):
+    """Test that a saved session is reused, and only one client is made"""
+    from scripts import update_links
+    from scripts.update_links import get_bluesky_client
+
+    path = os.path.join(update_links.CACHE_DIR, update_links.BLUESKY_SESSION_FILE)
+    os.makedirs(update_links.CACHE_DIR)
+    with open(path, "w") as f:
+        f.write("session-string\n")
+    made = []
+    monkeypatch.setattr(
+        update_links, "Client", lambda **kwargs: made.append(MagicMock()) or made[-1]
+    )
+
+    client = get_bluesky_client()
+
+    assert get_bluesky_client() is client
+    assert len(made) == 1
+    client.login.assert_called_once_with(session_string="session-string")
+    client.on_session_change.assert_called_once_with(update_links.save_bluesky_session)
+
+
+def test_get_bluesky_client_logs_in_when_session_fails(monkeypatch):
+    """Test that an unusable saved session falls back to the app password"""
+    from scripts import update_links
+    from scripts.update_links import get_bluesky_client, save_bluesky_session
+
+    save_bluesky_session(None, MagicMock(export=lambda: "expired"))
+    path = os.path.join(update_links.CACHE_DIR, update_links.BLUESKY_SESSION_FILE)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    client = MagicMock()
+    client.login.side_effect = [RuntimeError("ExpiredToken"), None]
+    monkeypatch.setattr(update_links, "Client", lambda **kwargs: client)
+    monkeypatch.setenv("BLUESKY_APP_PASSWORD", "password")
+
+    get_bluesky_client()
+
+    assert client.login.call_args_list[0].kwargs == {"session_string": "expired"}
+    assert client.login.call_args_list[1].args == (
+        update_links.BLUESKY_HANDLE,
+        "password",
+    )
+
+
+def test_get_x_user_id_looked_up_once(monkeypatch):
+    """Test that the X user ID is cached across clients and runs"""
+    from scripts import update_links
+    from scripts.update_links import get_x_user_id
+
+    monkeypatch.setenv("X_ACCESS_TOKEN", "123-token")
+    client = MagicMock()
+    client.get_me.return_value.data.id = 123
+
+    assert get_x_user_id(client) == "123"
+    update_links.reset_caches()
+    assert get_x_user_id(client) == "123"
+    assert client.get_me.call_count == 1
+
+    monkeypatch.setenv("X_ACCESS_TOKEN", "456-token")
+    client.get_me.return_value.data.id = 456
+    assert get_x_user_id(client) == "456"
+
+
+def test_upload_media_to_mastodon(mock_http, tmp_path):
+    """Test that the sync upload wraps the async one"""
+    from scripts.update_links import upload_media_to_mastodon
+
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"png bytes")
+    mock_http.add("https://mastodon.social/api/v2/media", json={"id": "42"})
+
+    assert upload_media_to_mastodon(str(image_path), "token", "Alt") == "42"
+
+    request = mock_http.requests[-1]
+    assert request.headers["Authorization"] == "Bearer token"
+    assert b'name="description"\r\n\r\nAlt' in request.content
+    assert b"png bytes" in request.content
+
+
+def test_get_url_metadata_negative_cache(mock_http, monkeypatch):
+    """Test that failures are remembered with exponentially growing expiry"""
+    from scripts import update_links
+
+    monkeypatch.setattr(update_links, "HTTP_RETRIES", 0)
+    mock_http.add("https://example.com/blocked", status_code=403)
+
+    assert get_url_metadata("https://example.com/blocked") == {}
+    assert get_url_metadata("https://example.com/blocked") == {}
+    assert mock_http.call_count == 1
+
+    failure = update_links.url_failure_cache.get("https://example.com/blocked")
+    assert failure["failures"] == 1
+    first_ttl = failure["retry_at"] - failure["failed_at"]
+    assert first_ttl == update_links.NEGATIVE_CACHE_BASE_TTL
+
+    # Once expired, the URL is retried; another failure doubles the expiry
+    update_links.url_failure_cache.set(
+        "https://example.com/blocked", {**failure, "retry_at": 0}
+    )
+    get_url_metadata("https://example.com/blocked")
+    failure = update_links.url_failure_cache.get("https://example.com/blocked")
+    assert mock_http.call_count == 2
+    assert failure["retry_at"] - failure["failed_at"] == first_ttl * 2
+
+    # A success clears the entry
+    update_links.url_failure_cache.set(
+        "https://example.com/blocked", {**failure, "retry_at": 0}
+    )
+    mock_http.add(
+        "https://example.com/blocked", html="<head><title>Back</title></head>"
+    )
+    assert get_url_metadata("https://example.com/blocked")["title"] == "Back"
+    assert update_links.url_failure_cache.get("https://example.com/blocked") is None
+
+
+def test_get_url_metadata_circuit_breaker(mock_http, monkeypatch, capsys):
+    """Test that a failing domain is short-circuited and reported"""
+    from scripts import update_links
+
+    monkeypatch.setattr(update_links, "HTTP_RETRIES", 0)
+    for i in range(5):
+        mock_http.add(f"https://slow.example.com/{i}", status_code=503)
+
+    for i in range(5):
+        assert get_url_metadata(f"https://slow.example.com/{i}") == {}
+
+    assert mock_http.call_count == update_links.CIRCUIT_BREAKER_THRESHOLD
+    assert update_links.circuit_is_open("slow.example.com")
+
+    update_links.print_metadata_failure_summary()
+    output = capsys.readouterr().out
+    assert "Circuit open for slow.example.com" in output
+    assert "slow.example.com: 3 failure(s) (circuit open)" in output
+    assert "and 2 for open circuits" in output
+
+
+def test_youtube_resolver_uses_oembed(local_server, monkeypatch):
+    """Test that YouTube metadata comes from oEmbed, not the watch page"""
+    from scripts import update_links
+
+    monkeypatch.setattr(
+        update_links, "YOUTUBE_OEMBED_ENDPOINT", f"{local_server.url}/oembed"
+    )
+    local_server.add_json(
+        "/oembed",
+        {
+            "title": "Donatello's marble carving technique",
+            "author_name": "V&A",
+            "thumbnail_url": "https://i.ytimg.com/vi/4dn8F06y5mc/hqdefault.jpg",
+        },
+    )
+
+    metadata = get_url_metadata("https://youtu.be/4dn8F06y5mc")
+
+    assert metadata == {
+        "title": "Donatello's marble carving technique",
+        "description": "V&A",
+        "image": "https://i.ytimg.com/vi/4dn8F06y5mc/hqdefault.jpg",
+    }
+    assert local_server.requests == [
+        "/oembed?url=https%3A%2F%2Fyoutu.be%2F4dn8F06y5mc&format=json"
+    ]
+
+
+def test_bluesky_resolver_uses_oembed(local_server, monkeypatch):
+    """Test that Bluesky post metadata comes from oEmbed"""
+    from scripts import update_links
+
+    monkeypatch.setattr(
+        update_links, "BLUESKY_OEMBED_ENDPOINT", f"{local_server.url}/oembed"
+    )
+    local_server.add_json(
+        "/oembed",
+        {
+            "author_name": "Kevin Schaul",
+            "html": '<blockquote class="bluesky-embed"><p lang="en">Charts &amp; '
+            "<b>data</b></p>&mdash; Kevin Schaul</blockquote>",
+        },
+    )
+
+    metadata = get_url_metadata(
+        "https://bsky.app/profile/kevinschaul.bsky.social/post/3abc"
+    )
+
+    assert metadata["title"] == "Kevin Schaul"
+    assert metadata["description"] == "Charts & data"
+
+
+def test_github_resolver_uses_rest_api(local_server, monkeypatch):
+    """Test that GitHub repo metadata comes from the REST API"""
+    from scripts import update_links
+
+    monkeypatch.setattr(update_links, "GITHUB_API_ENDPOINT", local_server.url)
+    local_server.add_json(
+        "/repos/kevinschaul/jump-start",
+        {"full_name": "kevinschaul/jump-start", "description": "A shortcut"},
+    )
+
+    metadata = get_url_metadata("https://github.com/kevinschaul/jump-start")
+
+    assert metadata == {
+        "title": "GitHub - kevinschaul/jump-start: A shortcut",
+        "description": "A shortcut",
+        "image": "https://opengraph.githubassets.com/1/kevinschaul/jump-start",
+    }
+
+
+def test_failed_resolver_falls_back_to_scraping(mock_http, monkeypatch):
+    """Test that a resolver error still lets the page itself be scraped"""
+    from scripts import update_links
+
+    monkeypatch.setattr(update_links, "HTTP_RETRIES", 0)
+    mock_http.add(
+        "https://github.com/someone/missing",
+        html="<head><title>someone/missing</title></head>",
+    )
+
+    metadata = get_url_metadata("https://github.com/someone/missing")
+
+    assert metadata["title"] == "someone/missing"
+    assert mock_http.call_count == 2
+    failure = update_links.url_failure_cache.get("https://github.com/someone/missing")
+    assert failure is None
+
+
+def test_resolvers_skip_non_video_and_non_repo_pages(mock_http):
+    """Test that channels, orgs and topics are scraped without an API call"""
+    for url in [
+        "https://www.youtube.com/@somechannel",
+        "https://github.com/orgs/python",
+        "https://github.com/topics/python",
+    ]:
+        mock_http.add(url, html="<head><title>Scraped</title></head>")
+
+        assert get_url_metadata(url)["title"] == "Scraped"
+
+    assert mock_http.call_count == 3
+
+
+def test_strip_tracking_params():
+    """Test that click-tracking parameters are dropped and others kept"""
+    from scripts.update_links import strip_tracking_params
+
+    assert (
+        strip_tracking_params(
+            "https://example.com/a?utm_source=x&id=3&UTM_Medium=y&fbclid=z"
+        )
+        == "https://example.com/a?id=3"
+    )
+    assert strip_tracking_params("https://example.com/a?gclid=1") == (
+        "https://example.com/a"
+    )
+    assert strip_tracking_params("https://example.com/a") == "https://example.com/a"
+
+
+def test_canonicalize_url_resolves_short_links_once(mock_http):
+    """Test that short links are resolved with HEAD and the chain remembered"""
+    from scripts import update_links
+    from scripts.update_links import canonicalize_url
+
+    mock_http.add(
+        "https://wapo.st/abc",
+        status_code=301,
+        headers={"Location": "https://www.washingtonpost.com/r?x=1"},
+    )
+    mock_http.add(
+        "https://www.washingtonpost.com/r?x=1",
+        status_code=302,
+        headers={"Location": "/article?utm_campaign=social&itid=7"},
+    )
+
+    canonical = "https://www.washingtonpost.com/article?itid=7"
+    assert canonicalize_url("https://wapo.st/abc?utm_source=twitter") == canonical
+    assert [r.method for r in mock_http.requests] == ["HEAD", "HEAD", "HEAD"]
+
+    assert canonicalize_url("https://wapo.st/abc") == canonical
+    assert mock_http.call_count == 3
+    assert update_links.redirect_cache.get("https://wapo.st/abc")["chain"] == [
+        "https://wapo.st/abc",
+        "https://www.washingtonpost.com/r?x=1",
+        "https://www.washingtonpost.com/article?utm_campaign=social&itid=7",
+    ]
+
+
+def test_canonicalize_url_falls_back_to_get_when_head_refused(mock_http):
+    """Test that servers rejecting HEAD are followed with a streamed GET"""
+    from scripts.update_links import canonicalize_url
+
+    def short(request):
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(301, headers={"Location": "https://example.com/long"})
+
+    mock_http.add("https://bit.ly/xyz", handler=short)
+    mock_http.add("https://example.com/long")
+
+    assert canonicalize_url("https://bit.ly/xyz") == "https://example.com/long"
+
+
+def test_canonicalize_url_unresolvable_short_link_not_cached(mock_http):
+    """Test that a failed resolution falls back without being remembered"""
+    from scripts import update_links
+    from scripts.update_links import canonicalize_url
+
+    mock_http.add("https://t.co/abc", status_code=404)
+
+    assert canonicalize_url("https://t.co/abc") == "https://t.co/abc"
+    assert update_links.redirect_cache.get("https://t.co/abc") is None
+
+
+def test_get_url_metadata_shares_cache_across_url_forms(mock_http):
+    """Test that short, tracked and canonical forms fetch the page only once"""
+    mock_http.add(
+        "https://wapo.st/abc",
+        status_code=301,
+        headers={"Location": "https://www.washingtonpost.com/article?utm_source=x"},
+    )
+    mock_http.add(
+        "https://www.washingtonpost.com/article",
+        text="<html><head><title>The Article</title></head>",
+    )
+
+    for url in [
+        "https://wapo.st/abc",
+        "https://www.washingtonpost.com/article?utm_medium=email",
+        "https://www.washingtonpost.com/article",
+    ]:
+        assert get_url_metadata(url)["title"] == "The Article"
+
+    fetched = [str(r.url) for r in mock_http.requests if r.method == "GET"]
+    assert fetched == ["https://www.washingtonpost.com/article"]
+
+
+def test_site_resolver_reads_local_content(tmp_path, monkeypatch, mock_http):
+    """Test that our own URLs are resolved from content/ with no network"""
+    from scripts import update_links
+
+    post_dir = tmp_path / "content" / "post" / "2024-06-28-introducing-jump-start"
+    post_dir.mkdir(parents=True)
+    (post_dir / "index.md").write_text(
+        '---\ntitle: "Introducing jump-start"\nslug: jump-start-intro\n'
+        "blurb: 'A shortcut to your favorite code'\n---\n\nBody text.\n"
+    )
+    link_dir = tmp_path / "content" / "link" / "2025-01-01_a_short_post"
+    link_dir.mkdir(parents=True)
+    (link_dir / "index.md").write_text(
+        "---\ndate: 2025-01-01\n---\n\nSome [linked](https://example.com) words.\n"
+    )
+    monkeypatch.setattr(update_links, "CONTENT_DIR", str(tmp_path / "content"))
+    update_links.reset_local_content_index()
+
+    metadata = get_url_metadata(
+        "https://www.kschaul.com/post/2024/06/28/jump-start-intro/"
+    )
+    assert metadata == {
+        "title": "Introducing jump-start",
+        "description": "A shortcut to your favorite code",
+        "image": update_links.SITE_IMAGE,
+    }
+
+    metadata = get_url_metadata("https://kschaul.com/link/2025-01-01_a_short_post/")
+    assert metadata["title"] == "Short post"
+    assert metadata["description"] == "Some linked words."
+
+    assert mock_http.call_count == 0
+    assert (
+        update_links.url_metadata_cache.get(
+            "https://kschaul.com/link/2025-01-01_a_short_post/"
+        )
+        is None
+    )